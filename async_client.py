@@ -0,0 +1,160 @@
+import asyncio
+import atexit
+import threading
+from collections import deque
+
+import httpx
+import ollama
+
+class AsyncExtractionClient:
+    def __init__(self, model, host=None, max_concurrency=4, timeout=120.0, keep_alive="30m", max_background=16):
+        self.model = model
+        self.host = host
+        self.max_concurrency = max_concurrency
+        self.max_background = max_background
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self._client = None
+        self._signal = None
+        self._workers = []
+        self._queues = {}
+        self._order = deque()
+        self._pending = 0
+        self._background = deque()
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        if self._client is not None:
+            return
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=self.max_concurrency)
+        self._client = ollama.AsyncClient(host=self.host, limits=limits)
+        self._signal = asyncio.Queue()
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.max_concurrency)]
+
+    def _enqueue(self, session_id, item):
+        queue = self._queues.get(session_id)
+        if queue is None:
+            queue = self._queues[session_id] = deque()
+            self._order.append(session_id)
+        queue.append(item)
+        self._pending += 1
+        self._signal.put_nowait(None)
+
+    def _enqueue_background(self, session_id, item):
+        while len(self._background) >= self.max_background:
+            dropped = self._background.popleft()
+            dropped[1][2].cancel()
+        self._background.append((session_id, item))
+        self._signal.put_nowait(None)
+
+    def _promote(self, ticket):
+        for entry in self._background:
+            if entry[1][3] is ticket:
+                self._background.remove(entry)
+                self._enqueue(*entry)
+                self._signal.get_nowait()
+                return
+
+    def _next(self):
+        if not self._order:
+            return self._background.popleft()[1] if self._background else None
+        session_id = self._order.popleft()
+        queue = self._queues[session_id]
+        item = queue.popleft()
+        self._pending -= 1
+        if queue:
+            self._order.append(session_id)
+        else:
+            del self._queues[session_id]
+        return item
+
+    async def _worker(self):
+        while True:
+            await self._signal.get()
+            item = self._next()
+            if item is None:
+                continue
+            prompt, on_chunk, future, _ = item
+            if future.done():
+                continue
+            task = asyncio.ensure_future(self._generate(prompt, on_chunk))
+            future.add_done_callback(lambda f, task=task: task.cancel() if f.cancelled() else None)
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                continue
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(result)
+
+    async def _generate(self, prompt, on_chunk):
+        pieces = []
+        stream = await self._client.generate(model=self.model, prompt=prompt, stream=True,
+                                             keep_alive=self.keep_alive)
+        async for part in stream:
+            pieces.append(part['response'])
+            if on_chunk:
+                on_chunk(part['response'])
+        return "".join(pieces)
+
+    async def generate(self, session_id, prompt, on_chunk=None, timeout=None, background=False, ticket=None):
+        self._start()
+        future = asyncio.get_running_loop().create_future()
+        if background:
+            self._enqueue_background(session_id, (prompt, on_chunk, future, ticket))
+        else:
+            self._enqueue(session_id, (prompt, on_chunk, future, ticket))
+        return await asyncio.wait_for(future, timeout or self.timeout)
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="ollama-client", daemon=True).start()
+                atexit.register(self.close)
+        return self._loop
+
+    def submit(self, session_id, prompt, on_chunk=None, timeout=None, background=False):
+        ticket = object()
+        coro = self.generate(session_id, prompt, on_chunk, timeout, background, ticket)
+        request = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        request.ticket = ticket
+        return request
+
+    def promote(self, request):
+        loop = self._loop
+        ticket = getattr(request, "ticket", None)
+        if loop is not None and ticket is not None and not request.done():
+            loop.call_soon_threadsafe(self._promote, ticket)
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None or not loop.is_running():
+            return
+
+        async def shutdown():
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=5)
+        except:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        self._client = None
+        self._queues = {}
+        self._order = deque()
+        self._pending = 0
+        self._background = deque()
+
+    def pending(self):
+        return self._pending
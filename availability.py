@@ -0,0 +1,159 @@
+import threading
+import time
+from datetime import date, timedelta
+
+from booking_store import store
+from doctor_directory import directory
+
+SLOT_MINUTES = 15
+BOOKING_LEAD_DAYS = 1
+
+def parse_interval(text):
+    try:
+        start, end = text.split("-")
+        sh, sm = start.strip().split(":")
+        eh, em = end.strip().split(":")
+        return int(sh) * 60 + int(sm), int(eh) * 60 + int(em)
+    except (ValueError, AttributeError):
+        return None
+
+def format_minutes(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def first_bookable_day(today=None):
+    return (today or date.today()) + timedelta(days=BOOKING_LEAD_DAYS)
+
+class DoctorUnits:
+    def __init__(self, time_slots, slot_minutes=SLOT_MINUTES):
+        self.source = time_slots
+        self.time_slots = tuple(time_slots)
+        units = set()
+        for slot in self.time_slots:
+            interval = parse_interval(slot)
+            if interval:
+                units.update(range(interval[0], interval[1] - slot_minutes + 1, slot_minutes))
+        self.starts = sorted(units)
+        self.ends = [start + slot_minutes for start in self.starts]
+        self.labels = [f"{format_minutes(s)}-{format_minutes(e)}" for s, e in zip(self.starts, self.ends)]
+        self.full_mask = (1 << len(self.starts)) - 1
+        self._masks = {}
+
+    def mask_for(self, slot):
+        mask = self._masks.get(slot)
+        if mask is None:
+            mask = 0
+            interval = parse_interval(slot)
+            if interval:
+                for i, (start, end) in enumerate(zip(self.starts, self.ends)):
+                    if start < interval[1] and interval[0] < end:
+                        mask |= 1 << i
+            self._masks[slot] = mask
+        return mask
+
+class AvailabilityEngine:
+    def __init__(self, directory, store, slot_minutes=SLOT_MINUTES, horizon_days=30, refresh_interval=5.0):
+        self.directory = directory
+        self.store = store
+        self.slot_minutes = slot_minutes
+        self.horizon_days = horizon_days
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._units = {}
+        self._ordered = {}
+        self._booked = {}
+        self._load = {}
+        self._window = None
+        self._loaded_at = 0.0
+
+    def units(self, doctor):
+        units = self._units.get(doctor['id'])
+        if units is None or units.source is not doctor['time_slots']:
+            units = self._units[doctor['id']] = DoctorUnits(doctor['time_slots'], self.slot_minutes)
+        return units
+
+    def doctors_for(self, specialty):
+        doctors = self.directory.by_specialization(specialty)
+        cached = self._ordered.get(specialty)
+        if cached is None or cached[0] is not doctors:
+            ordered = sorted((d for d in doctors if self.units(d).starts), key=lambda d: self.units(d).starts[0])
+            cached = self._ordered[specialty] = (doctors, ordered)
+        return cached[1]
+
+    def _refresh(self, start):
+        window = (start, start + timedelta(days=self.horizon_days))
+        if self._window == window and time.monotonic() - self._loaded_at < self.refresh_interval:
+            return
+        with self._lock:
+            booked = {}
+            for doctor_id, day, slot in self.store.booked_between(window[0].isoformat(), window[1].isoformat()):
+                doctor = self.directory.by_id(doctor_id)
+                if doctor is None:
+                    continue
+                key = (doctor_id, day)
+                booked[key] = booked.get(key, 0) | self.units(doctor).mask_for(slot)
+            load = {}
+            for (doctor_id, day), mask in booked.items():
+                load[doctor_id] = load.get(doctor_id, 0) + mask.bit_count()
+            self._booked = booked
+            self._load = load
+            self._window = window
+            self._loaded_at = time.monotonic()
+
+    def mark_booked(self, doctor, day, slot):
+        key = (doctor['id'], day.isoformat() if isinstance(day, date) else day)
+        with self._lock:
+            before = self._booked.get(key, 0)
+            after = before | self.units(doctor).mask_for(slot)
+            self._booked[key] = after
+            self._load[doctor['id']] = self._load.get(doctor['id'], 0) + (after & ~before).bit_count()
+
+    def free_mask(self, doctor, day):
+        return self.units(doctor).full_mask & ~self._booked.get((doctor['id'], day.isoformat()), 0)
+
+    def load(self, doctor):
+        return self._load.get(doctor['id'], 0)
+
+    def free_slots(self, doctor, day, start=None):
+        self._refresh(start or first_bookable_day())
+        units = self.units(doctor)
+        mask = self.free_mask(doctor, day)
+        return [label for i, label in enumerate(units.labels) if mask >> i & 1]
+
+    def next_free(self, doctor, within_days=None, start=None):
+        start = start or first_bookable_day()
+        self._refresh(start)
+        units = self.units(doctor)
+        for offset in range(within_days or self.horizon_days):
+            day = start + timedelta(days=offset)
+            mask = self.free_mask(doctor, day)
+            if mask:
+                return day, units.labels[(mask & -mask).bit_length() - 1]
+        return None
+
+    def earliest_free(self, specialty, within_days=None, start=None):
+        start = start or first_bookable_day()
+        self._refresh(start)
+        doctors = self.doctors_for(specialty)
+        for offset in range(within_days or self.horizon_days):
+            day = start + timedelta(days=offset)
+            best = None
+            for doctor in doctors:
+                units = self.units(doctor)
+                if best is not None and units.starts[0] >= best[0]:
+                    break
+                mask = self.free_mask(doctor, day)
+                if mask:
+                    bit = (mask & -mask).bit_length() - 1
+                    if best is None or units.starts[bit] < best[0]:
+                        best = (units.starts[bit], doctor, units.labels[bit])
+            if best:
+                return best[1], day, best[2]
+        return None
+
+def describe(slot):
+    if slot is None:
+        return "Fully booked"
+    day, label = slot
+    return f"{day.strftime('%a %d %b')} {label}"
+
+engine = AvailabilityEngine(directory, store)
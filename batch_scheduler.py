@@ -0,0 +1,92 @@
+import json
+import threading
+from concurrent.futures import Future
+
+class ExtractionBatcher:
+    def __init__(self, client, build_prompt, build_batch_prompt, window=0.05, max_batch=8):
+        self.client = client
+        self.build_prompt = build_prompt
+        self.build_batch_prompt = build_batch_prompt
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending = []
+        self._timer = None
+
+    def submit(self, session_id, full_context):
+        future = Future()
+        with self._lock:
+            self._pending.append((session_id, full_context, future))
+            if len(self._pending) >= self.max_batch:
+                batch = self._take()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if batch:
+            self._dispatch(batch)
+        return future
+
+    def _take(self):
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def flush(self):
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        batch = [entry for entry in batch if not entry[2].cancelled()]
+        if not batch:
+            return
+        if len(batch) == 1:
+            self._single(*batch[0])
+            return
+        prompt = self.build_batch_prompt([full_context for _, full_context, _ in batch])
+        response = self.client.submit(batch[0][0], prompt)
+        for _, _, future in batch:
+            future.add_done_callback(lambda f: self._abandon(batch, response))
+        response.add_done_callback(lambda f: self._fan_out(batch, f))
+
+    def _abandon(self, batch, response):
+        if all(future.cancelled() for _, _, future in batch):
+            response.cancel()
+
+    def _single(self, session_id, full_context, future):
+        response = self.client.submit(session_id, self.build_prompt(full_context))
+        future.add_done_callback(lambda f: response.cancel() if f.cancelled() else None)
+        response.add_done_callback(lambda f: self._resolve(future, f))
+
+    def _resolve(self, future, response):
+        if future.done():
+            return
+        if response.cancelled():
+            future.cancel()
+        elif response.exception() is not None:
+            future.set_exception(response.exception())
+        else:
+            future.set_result(response.result())
+
+    def _fan_out(self, batch, response):
+        results = {}
+        if not response.cancelled() and response.exception() is None:
+            text = response.result()
+            try:
+                results = json.loads(text[text.find('{'):text.rfind('}') + 1])
+            except ValueError:
+                results = {}
+        for i, (session_id, full_context, future) in enumerate(batch, 1):
+            if future.done():
+                continue
+            entry = results.get(str(i)) if isinstance(results, dict) else None
+            if isinstance(entry, dict):
+                future.set_result(json.dumps(entry))
+            else:
+                self._single(session_id, full_context, future)
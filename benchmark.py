@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fast_extract import fast_extract, is_confident
+from patient_case import PatientCase
+from questionnaire import QuestionPlan, get_follow_up_question
+from triage_core import SPECIALTY_SYMPTOMS, symptoms, mods, past, triage, doc, get_possible_diagnoses
+
+QUESTION_KEYS = ["pain_scale", "pregnancy_possibility", "age", "gender", "duration", "modifiers",
+                 "past_medical_history", "current_medications", "allergies", "previous_episodes",
+                 "fever_present", "eating_drinking", "sleep_patterns"]
+DURATIONS = ["since this morning", "2 days", "3 days", "a week", "2 weeks", "a month", "6 months"]
+CHATTER = ["honestly I am not sure what is going on", "my family told me to get it looked at",
+           "it started after a long trip", "I have been very busy at work lately",
+           "it comes and goes throughout the day", "nothing I try seems to help much"]
+STUB_RESPONSE = {"symptoms": ["fever", "cough"], "modifiers": ["moderate"], "past_medical_history": [],
+                 "duration": "3 days", "age": "", "gender": "", "habits": {}}
+
+def synthetic_case(r):
+    specialty = r.choice(list(SPECIALTY_SYMPTOMS))
+    pool = SPECIALTY_SYMPTOMS[specialty]
+    case_symptoms = r.sample(pool, r.randint(1, min(3, len(pool))))
+    if r.random() < 0.3:
+        case_symptoms.append(r.choice(symptoms))
+    case = PatientCase(
+        symptoms=case_symptoms,
+        modifiers=r.sample(mods, r.choice([0, 1, 1, 2])),
+        past_medical_history=r.sample(past, r.choice([0, 0, 1, 1, 2, 3])),
+        age=str(r.choice([r.randint(0, 17), r.randint(18, 59), r.randint(18, 59), r.randint(60, 95)])),
+        gender=r.choice(["male", "female", "female", "other"]),
+        duration=r.choice(DURATIONS),
+    )
+    if r.random() < 0.4:
+        case.pain_score = r.randint(1, 10)
+    if r.random() < 0.25:
+        case.habits = {"smoking": True, "smoking_details": {"years": r.randint(1, 40), "packs_per_day": r.choice([0.5, 1, 2])}}
+    if r.random() < 0.2:
+        case.habits["alcohol"] = True
+        case.habits["alcohol_details"] = {"drinks_per_week": r.randint(1, 30)}
+    return case
+
+def case_text(case, r):
+    parts = [f"{case.age} year old {case.gender}", f"{', '.join(case.ordered('symptoms'))} for {case.duration}"]
+    if case.modifiers:
+        parts.append(f"it feels {' and '.join(case.ordered('modifiers'))}")
+    if case.past_medical_history:
+        parts.append(f"history of {', '.join(case.ordered('past_medical_history'))}")
+    if r.random() < 0.5:
+        parts.extend(r.sample(CHATTER, 2))
+    return ". ".join(parts)
+
+def generate_cases(n, seed=0):
+    r = random.Random(seed)
+    cases = []
+    for _ in range(n):
+        case = synthetic_case(r)
+        asked = set(QUESTION_KEYS[:r.randint(0, len(QUESTION_KEYS))])
+        cases.append((case, asked, case_text(case, r)))
+    return cases
+
+class StubOllama(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, prefill=0.02, chunk_delay=0.002, chunks=8):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.prefill = prefill
+        self.chunk_delay = chunk_delay
+        self.chunks = chunks
+        self.requests = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="stub-ollama", daemon=True).start()
+        return self
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        server = self.server
+        server.requests += 1
+        text = json.dumps(STUB_RESPONSE)
+        step = max(1, len(text) // server.chunks)
+        pieces = [text[i:i + step] for i in range(0, len(text), step)]
+        lines = [json.dumps({"model": body.get("model"), "response": piece, "done": False}) + "\n" for piece in pieces]
+        lines.append(json.dumps({"model": body.get("model"), "response": "", "done": True,
+                                 "prompt_eval_count": len(body.get("prompt", "")) // 4}) + "\n")
+        payload = [line.encode() for line in lines]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(sum(len(line) for line in payload)))
+        self.end_headers()
+        time.sleep(server.prefill)
+        for line in payload:
+            self.wfile.write(line)
+            self.wfile.flush()
+            time.sleep(server.chunk_delay)
+
+def session_turns(case):
+    plan = QuestionPlan()
+    turns = 0
+    while True:
+        key, _ = plan.next(case)
+        if key is None:
+            return turns
+        plan.ask(key)
+        turns += 1
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+def measure(fn, items):
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        t = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - t)
+    total = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "n": len(items),
+        "total_s": round(total, 4),
+        "throughput_per_s": round(len(items) / total, 1) if total else 0.0,
+        "mean_us": round(sum(latencies) / len(latencies) * 1e6, 2) if latencies else 0.0,
+        "p50_us": round(percentile(latencies, 50) * 1e6, 2),
+        "p99_us": round(percentile(latencies, 99) * 1e6, 2),
+    }
+
+def run(n=5000, llm_cases=100, seed=0, prefill=0.02, chunk_delay=0.002):
+    cases = generate_cases(n, seed)
+    results = {
+        "triage": measure(lambda c: triage(c[0]), cases),
+        "doc": measure(lambda c: doc(c[0]), cases),
+        "get_possible_diagnoses": measure(lambda c: get_possible_diagnoses(c[0]), cases),
+        "get_follow_up_question": measure(lambda c: get_follow_up_question(c[0], c[1]), cases),
+        "question_session": measure(lambda c: session_turns(c[0]), cases),
+    }
+    results["question_session"]["turns_per_session"] = round(sum(session_turns(c[0]) for c in cases) / len(cases), 2)
+
+    stub = StubOllama(prefill, chunk_delay).start()
+    os.environ["OLLAMA_HOST"] = stub.url
+    import extraction
+    from extraction_cache import ExtractionCache
+    with tempfile.TemporaryDirectory() as tmp:
+        extraction.extraction_cache = ExtractionCache(os.path.join(tmp, "cache.db"))
+        extract = lambda text: extraction.extract_in_background(text, session_id="bench").result()
+        fast, slow = [], []
+        for _, _, text in cases:
+            (fast if is_confident(*fast_extract(text)) else slow).append(text)
+        results["extract_fast"] = measure(extract, fast[:llm_cases])
+        results["extract_llm"] = measure(extract, slow[:llm_cases])
+        results["extract_llm"]["llm_requests"] = stub.requests
+        results["extract_cache"] = measure(extract, slow[:llm_cases])
+    extraction.llm_client.close()
+    stub.shutdown()
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for stage, row in results.items():
+        old = baseline.get("results", {}).get(stage)
+        if not old:
+            continue
+        for metric in ("p50_us", "p99_us"):
+            if old[metric] and row[metric] > old[metric] * (1 + threshold):
+                regressions.append(f"{stage} {metric}: {old[metric]} -> {row[metric]} "
+                                   f"(+{(row[metric] / old[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the triage pipeline stages on synthetic cases")
+    parser.add_argument("--cases", type=int, default=5000)
+    parser.add_argument("--llm-cases", type=int, default=100, help="cases sent through each extraction path")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--prefill", type=float, default=0.02, help="stub Ollama delay before the first chunk (s)")
+    parser.add_argument("--chunk-delay", type=float, default=0.002, help="stub Ollama delay per streamed chunk (s)")
+    parser.add_argument("--out", help="results file (default benchmark-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging a regression")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = run(args.cases, args.llm_cases, args.seed, args.prefill, args.chunk_delay)
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "results": results,
+    }
+
+    print(f"{'stage':<24}{'n':>7}{'ops/s':>12}{'p50 us':>12}{'p99 us':>12}")
+    for stage, row in results.items():
+        print(f"{stage:<24}{row['n']:>7}{row['throughput_per_s']:>12}{row['p50_us']:>12}{row['p99_us']:>12}")
+
+    out = args.out or f"benchmark-{commit}.json"
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nsaved {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+import socket
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+EPOCH_MS = 1704067200000
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ID_LENGTH = 13
+PREFIX = "BK"
+
+def _check_node(node):
+    try:
+        value = int(node)
+    except (TypeError, ValueError):
+        raise ValueError(f"booking node id must be an integer, got {node!r}")
+    if not 0 <= value < 1 << NODE_BITS:
+        raise ValueError(f"booking node id must be between 0 and {(1 << NODE_BITS) - 1}, got {value}")
+    return value
+
+def _env_node():
+    node = os.environ.get("MEDEMI_NODE_ID")
+    return None if node is None else _check_node(node)
+
+def _default_node():
+    seed = f"{socket.gethostname()}:{os.getpid()}".encode()
+    return zlib.crc32(seed) & ((1 << NODE_BITS) - 1)
+
+def _encode(value):
+    chars = []
+    for _ in range(ID_LENGTH):
+        value, rem = divmod(value, 32)
+        chars.append(ALPHABET[rem])
+    return "".join(reversed(chars))
+
+def _decode(text):
+    value = 0
+    for ch in text:
+        value = value * 32 + ALPHABET.index(ch)
+    return value
+
+class BookingIdGenerator:
+    def __init__(self, node=None):
+        self._fixed_node = _env_node() if node is None else _check_node(node)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._node = None
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_id(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._node = _default_node() if self._fixed_node is None else self._fixed_node
+                self._last_ms = -1
+            now = int(time.time() * 1000) - EPOCH_MS
+            if now < self._last_ms:
+                now = self._last_ms
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & ((1 << SEQUENCE_BITS) - 1)
+                if self._sequence == 0:
+                    while now <= self._last_ms:
+                        time.sleep(0.0001)
+                        now = int(time.time() * 1000) - EPOCH_MS
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            value = (now << (NODE_BITS + SEQUENCE_BITS)) | (self._node << SEQUENCE_BITS) | self._sequence
+        return PREFIX + _encode(value)
+
+def parse_booking_id(booking_id):
+    value = _decode(booking_id[len(PREFIX):])
+    sequence = value & ((1 << SEQUENCE_BITS) - 1)
+    node = (value >> SEQUENCE_BITS) & ((1 << NODE_BITS) - 1)
+    ms = (value >> (NODE_BITS + SEQUENCE_BITS)) + EPOCH_MS
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc), node, sequence
+
+generator = BookingIdGenerator()
+
+def new_booking_id():
+    return generator.next_id()
@@ -0,0 +1,107 @@
+import json
+import os
+import sqlite3
+import threading
+
+from booking_ids import new_booking_id
+
+BOOKINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bookings.db")
+
+class SlotUnavailable(Exception):
+    pass
+
+class BookingStore:
+    def __init__(self, path=BOOKINGS_FILE):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS bookings (
+                    booking_id TEXT PRIMARY KEY,
+                    doctor_id INTEGER NOT NULL,
+                    appointment_date TEXT NOT NULL,
+                    slot TEXT NOT NULL,
+                    client_id TEXT,
+                    created_at TEXT NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS bookings_doctor_date_slot
+                    ON bookings (doctor_id, appointment_date, slot);
+                CREATE INDEX IF NOT EXISTS bookings_date_slot ON bookings (appointment_date, slot);
+                CREATE INDEX IF NOT EXISTS bookings_client ON bookings (client_id, created_at);
+            """)
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, booking_data, client_id=None, id_attempts=5):
+        if "booking_id" not in booking_data:
+            booking_data["booking_id"] = new_booking_id()
+        for attempt in range(id_attempts):
+            try:
+                self._insert(booking_data, client_id)
+                return booking_data
+            except sqlite3.IntegrityError as e:
+                if "doctor_id" in str(e):
+                    raise SlotUnavailable(
+                        f"{booking_data['preferred_time']} on {booking_data['preferred_date']} is already booked")
+                if "booking_id" not in str(e) or attempt == id_attempts - 1:
+                    raise
+                booking_data["booking_id"] = new_booking_id()
+
+    def _insert(self, booking_data, client_id):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO bookings (booking_id, doctor_id, appointment_date, slot, client_id, created_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (booking_data["booking_id"], booking_data["doctor_id"], booking_data["preferred_date"],
+                 booking_data["preferred_time"], client_id, booking_data["booking_time"], json.dumps(booking_data)))
+            conn.execute("COMMIT")
+        except:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def cancel(self, booking_id):
+        cur = self._connect().execute("DELETE FROM bookings WHERE booking_id = ?", (booking_id,))
+        return cur.rowcount > 0
+
+    def get(self, booking_id):
+        row = self._connect().execute("SELECT data FROM bookings WHERE booking_id = ?", (booking_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def booked_slots(self, doctor_id, appointment_date):
+        rows = self._connect().execute(
+            "SELECT slot FROM bookings WHERE doctor_id = ? AND appointment_date = ?",
+            (doctor_id, appointment_date)).fetchall()
+        return {row[0] for row in rows}
+
+    def booked_between(self, start_date, end_date):
+        return self._connect().execute(
+            "SELECT doctor_id, appointment_date, slot FROM bookings WHERE appointment_date BETWEEN ? AND ?",
+            (start_date, end_date)).fetchall()
+
+    def for_doctor(self, doctor_id, appointment_date):
+        rows = self._connect().execute(
+            "SELECT data FROM bookings WHERE doctor_id = ? AND appointment_date = ? ORDER BY slot",
+            (doctor_id, appointment_date)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def for_client(self, client_id, limit=None):
+        rows = self._connect().execute(
+            "SELECT data FROM bookings WHERE client_id = ? ORDER BY created_at DESC, booking_id DESC LIMIT ?",
+            (client_id, -1 if limit is None else limit)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count_for_client(self, client_id):
+        return self._connect().execute("SELECT COUNT(*) FROM bookings WHERE client_id = ?", (client_id,)).fetchone()[0]
+
+store = BookingStore()
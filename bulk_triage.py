@@ -0,0 +1,198 @@
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from triage_core import (SYMPTOM_IDS, SYMPTOM_WEIGHT, MENTAL_HEALTH, MODIFIER_IDS, MODIFIER_WEIGHT,
+                         HISTORY_IDS, HISTORY_WEIGHT, PSYCHIATRIC_MED, symptoms, _score)
+
+SYMPTOM_W = np.array(SYMPTOM_WEIGHT, dtype=np.float64)
+MODIFIER_W = np.array(MODIFIER_WEIGHT, dtype=np.float64)
+HISTORY_W = np.array(HISTORY_WEIGHT, dtype=np.float64)
+MENTAL_W = np.array(MENTAL_HEALTH, dtype=np.float64)
+PSYCH_W = np.array(PSYCHIATRIC_MED, dtype=np.float64)
+
+def _symptom_flags(names):
+    return np.array([s in names for s in symptoms], dtype=np.float64)
+
+SMOKING_SYMPTOMS = _symptom_flags(["shortness of breath", "chest pain", "cough"])
+VAPING_SYMPTOMS = _symptom_flags(["shortness of breath", "chest pain"])
+ALCOHOL_SYMPTOMS = _symptom_flags(["abdominal pain", "nausea", "vomiting"])
+DRUG_SYMPTOMS = _symptom_flags(["chest pain", "dizziness", "anxiety"])
+
+NUMBER = (int, float)
+MAX_EXACT_AGE = 2 ** 53
+
+class _Columns:
+    def __init__(self, n):
+        self.n = n
+        self.sym_rows, self.sym_cols = [], []
+        self.mod_rows, self.mod_cols = [], []
+        self.hist = []
+        self.pain = np.zeros(n)
+        self.age = np.full(n, np.nan)
+        self.smoking = np.zeros(n, dtype=bool)
+        self.pack_years = np.zeros(n)
+        self.vaping = np.zeros(n, dtype=bool)
+        self.alcohol = np.zeros(n, dtype=bool)
+        self.drinks = np.zeros(n)
+        self.drug_use = np.zeros(n, dtype=bool)
+        self.fallback = []
+
+    def add(self, row, data):
+        symptom_ids = [i for i in map(SYMPTOM_IDS.get, data.get("symptoms", [])) if i is not None]
+        self.sym_rows.extend([row] * len(symptom_ids))
+        self.sym_cols.extend(symptom_ids)
+
+        modifier_ids = [i for i in map(MODIFIER_IDS.get, data.get("modifiers", [])) if i is not None]
+        self.mod_rows.extend([row] * len(modifier_ids))
+        self.mod_cols.extend(modifier_ids)
+
+        pain_score = data.get("pain_score", 0)
+        if pain_score:
+            if not isinstance(pain_score, NUMBER):
+                raise TypeError(pain_score)
+            self.pain[row] = pain_score
+
+        age = data.get("age", "")
+        if age:
+            try:
+                a = int(age)
+            except:
+                a = None
+            if a is not None:
+                if not -MAX_EXACT_AGE < a < MAX_EXACT_AGE:
+                    raise OverflowError(a)
+                self.age[row] = a
+
+        history_ids = [i for i in map(HISTORY_IDS.get, data.get("past_medical_history", [])) if i is not None]
+        while len(self.hist) < len(history_ids):
+            self.hist.append(([], []))
+        for pos, i in enumerate(history_ids):
+            rows, cols = self.hist[pos]
+            rows.append(row)
+            cols.append(i)
+
+        habits_data = data.get("habits", {})
+        if habits_data.get("smoking"):
+            smoking_status = habits_data.get("smoking_details", {})
+            years = smoking_status.get("years", 0)
+            packs_per_day = smoking_status.get("packs_per_day", 0)
+            if not isinstance(years, NUMBER) or not isinstance(packs_per_day, NUMBER):
+                raise TypeError(years, packs_per_day)
+            self.smoking[row] = True
+            self.pack_years[row] = years * packs_per_day
+        if habits_data.get("vaping"):
+            self.vaping[row] = True
+        if habits_data.get("alcohol"):
+            drinks_per_week = habits_data.get("alcohol_details", {}).get("drinks_per_week", 0)
+            if not isinstance(drinks_per_week, NUMBER):
+                raise TypeError(drinks_per_week)
+            self.alcohol[row] = True
+            self.drinks[row] = drinks_per_week
+        if habits_data.get("drug_use"):
+            self.drug_use[row] = True
+
+    def _per_row(self, rows, cols, weights):
+        return np.bincount(rows, weights=weights[cols], minlength=self.n)
+
+    def scores(self):
+        sym_rows = np.array(self.sym_rows, dtype=np.intp)
+        sym_cols = np.array(self.sym_cols, dtype=np.intp)
+        mod_rows = np.array(self.mod_rows, dtype=np.intp)
+        mod_cols = np.array(self.mod_cols, dtype=np.intp)
+
+        score = self._per_row(sym_rows, sym_cols, SYMPTOM_W) + self._per_row(mod_rows, mod_cols, MODIFIER_W)
+
+        pain = self.pain
+        score += np.select([pain >= 8, pain >= 6, pain >= 4, pain != 0], [5, 3, 2, 1], 0)
+
+        age = self.age
+        with np.errstate(invalid="ignore"):
+            score *= np.where(age >= 60, 1.5 + (age - 60) / 10, np.where(age < 2, 1.3, 1.0))
+
+        has_psych_meds = np.zeros(self.n, dtype=bool)
+        for rows, cols in self.hist:
+            rows = np.array(rows, dtype=np.intp)
+            cols = np.array(cols, dtype=np.intp)
+            score[rows] += HISTORY_W[cols]
+            has_psych_meds[rows] |= PSYCH_W[cols] > 0
+
+        has_mental_symptoms = self._per_row(sym_rows, sym_cols, MENTAL_W) > 0
+        score += np.where(has_psych_meds & has_mental_symptoms, 3, 0)
+
+        score += self._habit_risk(sym_rows, sym_cols)
+        return score
+
+    def _habit_risk(self, sym_rows, sym_cols):
+        pack_years = self.pack_years
+        smoking = np.select([pack_years > 30, pack_years > 20, pack_years > 10, pack_years > 5], [5, 4, 3, 2], 1)
+        smoking = np.where(self._per_row(sym_rows, sym_cols, SMOKING_SYMPTOMS) > 0, smoking * 1.5, smoking)
+
+        vaping = 2 + np.where(self._per_row(sym_rows, sym_cols, VAPING_SYMPTOMS) > 0, 2, 0)
+
+        drinks = self.drinks
+        alcohol = np.select([drinks > 14, drinks > 7], [3, 2], 1)
+        alcohol = alcohol + np.where(self._per_row(sym_rows, sym_cols, ALCOHOL_SYMPTOMS) > 0, 2, 0)
+
+        drug_use = 4 + np.where(self._per_row(sym_rows, sym_cols, DRUG_SYMPTOMS) > 0, 3, 0)
+
+        return (np.where(self.smoking, smoking, 0) + np.where(self.vaping, vaping, 0)
+                + np.where(self.alcohol, alcohol, 0) + np.where(self.drug_use, drug_use, 0))
+
+def _round1(values):
+    rounded = np.round(values, 1)
+    tens = values * 10
+    for i in np.flatnonzero(np.abs(tens - np.floor(tens) - 0.5) < 1e-6):
+        rounded[i] = round(float(values[i]), 1)
+    return rounded
+
+def score_cases(cases):
+    cases = cases if isinstance(cases, list) else list(cases)
+    columns = _Columns(len(cases))
+    for row, data in enumerate(cases):
+        try:
+            columns.add(row, data)
+        except:
+            columns.fallback.append(row)
+
+    scores = _round1(columns.scores())
+    for row in columns.fallback:
+        scores[row] = _score(cases[row])
+    return scores
+
+def score_file(path, chunk_size=100000):
+    with open(path) as f:
+        chunk = []
+        for line in f:
+            if line.strip():
+                chunk.append(json.loads(line))
+            if len(chunk) >= chunk_size:
+                yield score_cases(chunk)
+                chunk = []
+        if chunk:
+            yield score_cases(chunk)
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score an archive of extracted patient cases (one JSON object per line)")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--out", help="write one score per line to this file instead of stdout")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = 0
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        for scores in score_file(args.path, args.chunk_size):
+            out.write("".join(f"{s}\n" for s in scores.tolist()))
+            count += len(scores)
+    finally:
+        if args.out:
+            out.close()
+    print(f"scored {count} cases in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
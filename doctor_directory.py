@@ -0,0 +1,66 @@
+import json
+import os
+import threading
+import time
+
+DOCTORS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "doctors.json")
+
+class DoctorDirectory:
+    def __init__(self, path=DOCTORS_FILE, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = -1
+        self._checked_at = 0.0
+        self._index = self._build_index([])
+
+    def _build_index(self, doctors):
+        by_specialization = {}
+        by_id = {}
+        by_slot = {}
+        for doctor in doctors:
+            by_specialization.setdefault(doctor.get('specialization'), []).append(doctor)
+            by_id[doctor.get('id')] = doctor
+            for slot in doctor.get('time_slots', []):
+                by_slot.setdefault(slot, []).append(doctor)
+        return doctors, by_specialization, by_id, by_slot
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval and self._mtime != -1:
+            return self._index
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        self._checked_at = now
+        if mtime == self._mtime:
+            return self._index
+
+        with self._lock:
+            if mtime != self._mtime:
+                try:
+                    with open(self.path, 'r') as f:
+                        doctors = json.load(f)['doctors']
+                except:
+                    return self._index
+                self._index = self._build_index(doctors)
+                self._mtime = mtime
+        return self._index
+
+    def all(self):
+        return self._refresh()[0]
+
+    def by_specialization(self, specialization):
+        return self._refresh()[1].get(specialization, [])
+
+    def by_id(self, doctor_id):
+        return self._refresh()[2].get(doctor_id)
+
+    def by_time_slot(self, slot):
+        return self._refresh()[3].get(slot, [])
+
+    def specializations(self):
+        return list(self._refresh()[1])
+
+directory = DoctorDirectory()
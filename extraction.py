@@ -0,0 +1,142 @@
+import json
+import time
+from concurrent.futures import Future, InvalidStateError
+
+from async_client import AsyncExtractionClient
+from batch_scheduler import ExtractionBatcher
+from extraction_cache import ExtractionCache
+from fast_extract import fast_extract, is_confident
+from json_stream import StreamingJSONObject
+from metrics import registry as metrics
+from prompts import MODEL, PROMPT_VERSION, build_prompt, build_batch_prompt
+
+extraction_cache = ExtractionCache()
+llm_client = AsyncExtractionClient(MODEL)
+
+def build_context(text, conversation_history=""):
+    if conversation_history:
+        return f"{text}\n\nAdditional Information:\n{conversation_history}"
+    return text
+
+batcher = ExtractionBatcher(llm_client, build_prompt, build_batch_prompt)
+
+@metrics.timed("extract_with_llm")
+def extract_with_llm(text, conversation_history="", session_id="default"):
+    full_context = build_context(text, conversation_history)
+    
+    result, coverage = fast_extract(full_context)
+    if is_confident(result, coverage):
+        metrics.inc("extractions", path="fast")
+        return json.dumps(result)
+    
+    cached = extraction_cache.get(full_context, MODEL, PROMPT_VERSION)
+    if cached is not None:
+        metrics.inc("extractions", path="cache")
+        return cached
+    
+    metrics.inc("extractions", path="llm")
+    try:
+        response = batcher.submit(session_id, full_context).result()
+    except:
+        metrics.inc("errors", stage="extraction")
+        return "{}"
+    _cache_if_complete(full_context, response)
+    return response
+
+def _cache_if_complete(full_context, response):
+    parser = StreamingJSONObject()
+    for _ in parser.feed(response):
+        pass
+    if parser.done:
+        extraction_cache.put(full_context, MODEL, PROMPT_VERSION, response)
+    else:
+        metrics.inc("errors", stage="extraction")
+    return parser.done
+
+class ExtractionFuture(Future):
+    def __init__(self):
+        super().__init__()
+        self.request = None
+        self.parser = None
+
+    def partial(self):
+        if self.done() and not self.cancelled():
+            return self.result()
+        return dict(self.parser.fields) if self.parser is not None else {}
+
+    def cancel(self):
+        if self.request is not None:
+            self.request.cancel()
+        return super().cancel()
+
+    def resolve(self, fields):
+        try:
+            self.set_result(fields)
+        except InvalidStateError:
+            pass
+
+def _feed(parser, chunk):
+    for _ in parser.feed(chunk):
+        pass
+
+def _finish(future, full_context, parser, streamed, request, path, start):
+    if request.cancelled():
+        if not future.cancelled():
+            metrics.inc("extractions_cancelled", reason="dropped")
+            future.cancel()
+        return
+    if request.exception() is not None:
+        metrics.inc("errors", stage="extraction")
+        future.resolve({})
+        return
+    response = request.result()
+    if not streamed:
+        _feed(parser, response)
+    if parser.done:
+        extraction_cache.put(full_context, MODEL, PROMPT_VERSION, response)
+    else:
+        metrics.inc("errors", stage="extraction")
+    future.resolve(dict(parser.fields))
+    metrics.observe(f"extract_{path}", time.perf_counter() - start)
+
+def extract_in_background(text, conversation_history="", session_id="default", prefetch=False):
+    start = time.perf_counter()
+    future = ExtractionFuture()
+    full_context = build_context(text, conversation_history)
+    
+    result, coverage = fast_extract(full_context)
+    if is_confident(result, coverage):
+        metrics.inc("extractions", path="fast")
+        future.set_result(dict(result))
+        metrics.observe("extract_fast", time.perf_counter() - start)
+        return future
+    
+    parser = StreamingJSONObject()
+    cached = extraction_cache.get(full_context, MODEL, PROMPT_VERSION)
+    if cached is not None:
+        metrics.inc("extractions", path="cache")
+        _feed(parser, cached)
+        future.set_result(dict(parser.fields))
+        metrics.observe("extract_cache", time.perf_counter() - start)
+        return future
+    
+    path = "prefetch" if prefetch else "llm"
+    metrics.inc("extractions", path=path)
+    future.parser = parser
+    streamed = prefetch or not llm_client.pending()
+    if streamed:
+        future.request = llm_client.submit(session_id, build_prompt(full_context),
+                                           on_chunk=lambda chunk: _feed(parser, chunk), background=prefetch)
+    else:
+        future.request = batcher.submit(session_id, full_context)
+    future.request.add_done_callback(
+        lambda request: _finish(future, full_context, parser, streamed, request, path, start))
+    return future
+
+def promote(future):
+    if future.request is not None:
+        llm_client.promote(future.request)
+
+def adds_clinical_facts(conversation_entry):
+    result, _ = fast_extract(conversation_entry)
+    return bool(result["symptoms"] or result["modifiers"] or result["past_medical_history"])
@@ -0,0 +1,67 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "extraction_cache.db")
+
+def normalize_text(text):
+    return " ".join(text.lower().split())
+
+class ExtractionCache:
+    def __init__(self, path=CACHE_FILE, max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS extractions (
+                                key TEXT PRIMARY KEY,
+                                response TEXT NOT NULL,
+                                last_used REAL NOT NULL)""")
+            conn.execute("CREATE INDEX IF NOT EXISTS extractions_last_used ON extractions (last_used)")
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def key(self, text, model, prompt_version):
+        raw = "\x1f".join([model, prompt_version, normalize_text(text)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, text, model, prompt_version):
+        key = self.key(text, model, prompt_version)
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT response FROM extractions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE extractions SET last_used = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            return row[0]
+        except sqlite3.Error:
+            return None
+
+    def put(self, text, model, prompt_version, response):
+        key = self.key(text, model, prompt_version)
+        try:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO extractions (key, response, last_used) VALUES (?, ?, ?)",
+                         (key, response, time.time()))
+            overflow = conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute("""DELETE FROM extractions WHERE key IN (
+                                    SELECT key FROM extractions ORDER BY last_used LIMIT ?)""", (overflow,))
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute("DELETE FROM extractions")
+        conn.commit()
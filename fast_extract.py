@@ -0,0 +1,244 @@
+import re
+from collections import deque
+
+from triage_core import symptoms, mods, past
+
+SYMPTOM_SYNONYMS = {
+    "feverish": "fever", "high temperature": "fever",
+    "coughing": "cough",
+    "headaches": "headache", "head ache": "headache", "head hurts": "headache", "migraine": "headache",
+    "nauseous": "nausea", "nauseated": "nausea", "queasy": "nausea", "feel sick": "nausea",
+    "tired": "fatigue", "exhausted": "fatigue", "tiredness": "fatigue", "weakness": "fatigue",
+    "dizzy": "dizziness", "lightheaded": "dizziness", "light headed": "dizziness",
+    "short of breath": "shortness of breath", "breathless": "shortness of breath",
+    "breathlessness": "shortness of breath", "difficulty breathing": "shortness of breath",
+    "trouble breathing": "shortness of breath", "can't breathe": "shortness of breath",
+    "cant breathe": "shortness of breath",
+    "chest tightness": "chest pain", "tight chest": "chest pain", "chest hurts": "chest pain",
+    "stomach ache": "abdominal pain", "stomachache": "abdominal pain", "stomach pain": "abdominal pain",
+    "belly pain": "abdominal pain", "tummy pain": "abdominal pain", "tummy ache": "abdominal pain",
+    "loose stools": "diarrhea", "loose motions": "diarrhea", "diarrhoea": "diarrhea",
+    "throwing up": "vomiting", "threw up": "vomiting", "puking": "vomiting", "vomit": "vomiting",
+    "throat pain": "sore throat", "scratchy throat": "sore throat",
+    "blocked nose": "runny nose", "stuffy nose": "runny nose", "nasal congestion": "runny nose",
+    "body aches": "muscle aches", "body ache": "muscle aches", "muscle pain": "muscle aches",
+    "joint aches": "joint pain", "aching joints": "joint pain",
+    "swollen": "swelling",
+    "sweating at night": "night sweats", "night sweat": "night sweats",
+    "shivering": "chills", "shivers": "chills",
+    "swollen legs": "edema", "swollen ankles": "edema",
+    "peeing less": "reduced urine output", "less urine": "reduced urine output",
+    "can't sleep": "insomnia", "cant sleep": "insomnia", "trouble sleeping": "insomnia",
+    "sleepless": "insomnia", "sleeplessness": "insomnia",
+    "anxious": "anxiety", "nervous": "anxiety",
+    "panic attack": "panic attacks",
+    "depressed": "sadness", "feeling down": "sadness", "feeling low": "sadness", "sad": "sadness",
+    "hopeless": "hopelessness",
+    "suicidal": "suicidal thoughts", "want to die": "suicidal thoughts", "kill myself": "suicidal thoughts",
+    "hearing voices": "hallucinations", "seeing things": "hallucinations",
+    "paranoid": "paranoia",
+    "can't concentrate": "difficulty concentrating", "cant concentrate": "difficulty concentrating",
+    "poor concentration": "difficulty concentrating",
+    "forgetful": "memory problems", "memory loss": "memory problems",
+    "restless": "restlessness", "irritable": "irritability",
+    "worrying a lot": "excessive worry", "worry a lot": "excessive worry",
+    "late period": "missed period", "period is late": "missed period",
+    "heavy periods": "heavy menstrual bleeding", "heavy bleeding": "heavy menstrual bleeding",
+    "period pain": "painful periods", "period cramps": "painful periods", "menstrual cramps": "painful periods",
+    "burning urination": "burning sensation during urination", "burns when i pee": "burning sensation during urination",
+    "pain when peeing": "painful urination", "painful peeing": "painful urination",
+    "peeing a lot": "frequent urination", "urinating often": "frequent urination",
+    "constipated": "constipation", "bloated": "bloating",
+}
+
+MODIFIER_SYNONYMS = {
+    "slight": "mild", "slightly": "mild", "a little": "mild", "minor": "mild",
+    "very bad": "severe", "terrible": "severe", "excruciating": "severe", "unbearable": "severe",
+    "extreme": "severe", "intense": "severe", "really bad": "severe",
+    "comes and goes": "intermittent", "on and off": "intermittent", "off and on": "intermittent",
+    "all the time": "constant", "constantly": "constant", "nonstop": "constant", "non-stop": "constant",
+    "sudden": "sudden onset", "suddenly": "sudden onset", "all of a sudden": "sudden onset",
+    "gradually": "gradual onset", "gradual": "gradual onset",
+    "getting worse": "worsening", "getting better": "improving",
+    "keeps coming back": "recurring", "recurrent": "recurring",
+    "pounding": "throbbing", "pulsating": "throbbing",
+    "crampy": "cramping", "cramps": "cramping",
+}
+
+HISTORY_SYNONYMS = {
+    "diabetic": "diabetes", "high blood sugar": "diabetes",
+    "high blood pressure": "hypertension", "high bp": "hypertension",
+    "asthmatic": "asthma",
+    "heart problems": "heart disease", "heart condition": "heart disease", "heart attack": "heart disease",
+    "kidney problems": "kidney disease", "liver problems": "liver disease",
+    "thyroid": "thyroid disorder", "hypothyroidism": "thyroid disorder", "hyperthyroidism": "thyroid disorder",
+    "surgery": "previous surgeries", "operation": "previous surgeries",
+    "bipolar": "bipolar disorder",
+    "antidepressants": "on antidepressants", "antipsychotics": "on antipsychotics",
+    "mood stabilizers": "on mood stabilizers", "birth control pills": "on birth control",
+    "the pill": "on birth control",
+    "miscarriage": "previous miscarriage", "c-section": "cesarean section",
+}
+
+NEGATION = re.compile(r"\b(no|not|denies|denied|deny|without|never|negative for|free of|"
+                      r"don't have|dont have|doesn't have|doesnt have|didn't have|none)\b")
+HISTORY_CUE = re.compile(r"\b(history of|diagnosed|known|suffer(?:s|ing)? from|had|past|chronic|on treatment for)\b")
+FAMILY_CUE = re.compile(r"\b(family|father|mother|dad|mom|mum|brother|sister|uncle|aunt|grand(?:father|mother|parents?)|"
+                        r"parents?|siblings?)\b")
+SENTENCE_BREAK = re.compile(r"[.;,!?\n]|\bbut\b")
+CLAUSE_BREAK = re.compile(r"[.;,!?\n]|\b(?:but|and|with)\b")
+
+AGE = re.compile(r"\b(\d{1,3})\s*(?:-|\s)?(?:years?|yrs?|yr)(?:\s*|-)old\b|\b(\d{1,3})\s*(?:y/?o|yo)\b|"
+                 r"\baged?\s*(?:is\s*)?(\d{1,3})\b|\b(\d{1,3})\s*(?:[mf])\b|\bi(?:'m| am)\s+(\d{1,3})\b(?!\s*(?:minute|hour|day|week|month|year))")
+DURATION = re.compile(r"\b(\d+|a|an|one|two|three|four|five|six|seven|few|couple of)\s*"
+                      r"(minute|hour|day|week|month|year)s?\b(?!\s*-?\s*old)")
+MALE = re.compile(r"\b(male|man|boy|son|father|husband|gentleman|he|him|his|\d{1,3}\s*m)\b")
+FEMALE = re.compile(r"\b(female|woman|girl|daughter|mother|wife|lady|she|her|pregnant|\d{1,3}\s*f)\b")
+
+STOPWORDS = set("""
+a an the and or i i'm im me my mine we our you your he she him her his it its they them their
+is am are was were be been being have has had having do does did doing with for of to in on at by
+from since about as so very really quite also just some any this that these those there here
+feel feeling felt got get getting having lot lots bit little since ago past last now today
+yesterday days weeks years time times also too again q a additional information yes no yeah nope ok
+okay patient symptoms symptom pain hurts hurt
+""".split())
+
+FAST_PATH_MIN_COVERAGE = 0.7
+
+class Automaton:
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for pattern, payload in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append((len(pattern), payload))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def finditer(self, text):
+        node = 0
+        goto = self.goto
+        fail = self.fail
+        out = self.out
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, payload in out[node]:
+                yield i - length + 1, i + 1, payload
+
+def _build_patterns():
+    patterns = {}
+    for category, vocab, synonyms in (("modifiers", mods, MODIFIER_SYNONYMS),
+                                      ("past_medical_history", past, HISTORY_SYNONYMS),
+                                      ("symptoms", symptoms, SYMPTOM_SYNONYMS)):
+        terms = {term.lower(): term for term in vocab}
+        terms.update(synonyms)
+        for text, canonical in terms.items():
+            patterns.setdefault(text, []).append((category, canonical))
+    for text, payload in list(patterns.items()):
+        if not text.endswith("s") and text + "s" not in patterns:
+            patterns[text + "s"] = payload
+    return patterns
+
+LEXICON = Automaton(_build_patterns())
+
+def _is_word(text, start, end):
+    return ((start == 0 or not text[start - 1].isalnum()) and
+            (end == len(text) or not text[end].isalnum()))
+
+def _strip_questions(text):
+    lines = [line[2:].strip() if line.startswith("A:") else line
+             for line in text.split("\n")
+             if not line.startswith("Q:") and line.strip() != "Additional Information:"]
+    return "\n".join(lines)
+
+def _clause_prefix(text, start, breaker=CLAUSE_BREAK):
+    prefix = text[:start]
+    breaks = [m.end() for m in breaker.finditer(prefix)]
+    return prefix[breaks[-1]:] if breaks else prefix
+
+def fast_extract(text):
+    text = _strip_questions(text).lower()
+    result = {"symptoms": [], "modifiers": [], "past_medical_history": [],
+              "duration": "", "age": "", "gender": ""}
+    covered = []
+
+    matches = [(start, end, payload) for start, end, payload in LEXICON.finditer(text)
+               if _is_word(text, start, end)]
+    matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+    last_end = -1
+    for start, end, payload in matches:
+        if start < last_end:
+            continue
+        last_end = end
+        clause = _clause_prefix(text, start)
+        if NEGATION.search(clause):
+            continue
+        if FAMILY_CUE.search(clause) and HISTORY_CUE.search(clause):
+            continue
+        sentence = _clause_prefix(text, start, SENTENCE_BREAK)
+        if not (FAMILY_CUE.search(sentence) and HISTORY_CUE.search(sentence)):
+            covered.append((start, end))
+        categories = dict(payload)
+        if "symptoms" in categories and "past_medical_history" in categories:
+            category = "past_medical_history" if HISTORY_CUE.search(clause) else "symptoms"
+        else:
+            category = payload[0][0]
+        value = categories[category]
+        if value not in result[category]:
+            result[category].append(value)
+
+    age = AGE.search(text)
+    if age:
+        result["age"] = next(g for g in age.groups() if g)
+        covered.append(age.span())
+    duration = DURATION.search(text)
+    if duration:
+        result["duration"] = duration.group(0)
+        covered.append(duration.span())
+    male = MALE.search(text)
+    female = FEMALE.search(text)
+    if male and not female:
+        result["gender"] = "male"
+        covered.append(male.span())
+    elif female and not male:
+        result["gender"] = "female"
+        covered.append(female.span())
+    covered.extend(m.span() for m in HISTORY_CUE.finditer(text))
+
+    content = 0
+    hits = 0
+    for token in re.finditer(r"[a-z0-9']+", text):
+        word = token.group(0)
+        if word in STOPWORDS or word.isdigit():
+            continue
+        content += 1
+        if any(start <= token.start() and token.end() <= end for start, end in covered):
+            hits += 1
+    coverage = hits / content if content else 0.0
+    return result, coverage
+
+def is_confident(result, coverage):
+    return bool(result["symptoms"]) and coverage >= FAST_PATH_MIN_COVERAGE
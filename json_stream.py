@@ -0,0 +1,79 @@
+import json
+
+class StreamingJSONObject:
+    def __init__(self):
+        self.fields = {}
+        self._buf = []
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+
+    def feed(self, chunk):
+        completed = []
+        for ch in chunk:
+            if self._done:
+                break
+            if not self._started:
+                if ch == '{':
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            pos = len(self._buf)
+            self._buf.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._value_start is None:
+                            self._key = json.loads("".join(self._buf[self._key_start:pos + 1]))
+                        else:
+                            self._emit(pos + 1, completed)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None:
+                    self._key_start = pos
+            elif ch == ':' and self._depth == 1:
+                self._value_start = pos + 1
+            elif ch in '[{':
+                self._depth += 1
+            elif ch in ']}':
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    self._emit(pos + 1, completed)
+                elif self._depth == 0:
+                    if self._value_start is not None:
+                        self._emit(pos, completed)
+                    self._done = True
+            elif ch == ',' and self._depth == 1 and self._value_start is not None:
+                self._emit(pos, completed)
+        return completed
+
+    def _emit(self, end, completed):
+        raw = "".join(self._buf[self._value_start:end]).strip()
+        self._value_start = None
+        if not raw or self._key is None:
+            return
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return
+        self.fields[self._key] = value
+        completed.append((self._key, value))
+        self._key = None
+
+    @property
+    def done(self):
+        return self._done
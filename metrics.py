@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "medemi"
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _labels(pairs):
+    return ",".join(f'{k}="{v}"' for k, v in pairs)
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        out = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            out.append(f"{name}_bucket{{{_labels(labels + [('le', le)])}}} {cumulative}")
+        out.append(f"{name}_sum{{{_labels(labels)}}} {self.sum}")
+        out.append(f"{name}_count{{{_labels(labels)}}} {self.count}")
+        return out
+
+class _Timer:
+    __slots__ = ("registry", "stage", "start")
+
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+class MetricsRegistry:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+        self._started = False
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def timer(self, stage):
+        return _Timer(self, stage)
+
+    def timed(self, stage):
+        def decorate(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(stage, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            stages = {stage: (list(h.counts), h.sum, h.count) for stage, h in self._stages.items()}
+            counters = dict(self._counters)
+        return stages, counters
+
+    def render(self):
+        stages, counters = self.snapshot()
+        name = f"{PREFIX}_stage_seconds"
+        lines = [f"# HELP {name} Time spent in each consultation stage.", f"# TYPE {name} histogram"]
+        for stage in sorted(stages):
+            histogram = Histogram(self.buckets)
+            histogram.counts, histogram.sum, histogram.count = stages[stage]
+            lines.extend(histogram.lines(name, [("stage", stage)]))
+        typed = set()
+        for (counter, labels) in sorted(counters):
+            name = f"{PREFIX}_{counter}_total"
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            suffix = f"{{{_labels(list(labels))}}}" if labels else ""
+            lines.append(f"{name}{suffix} {counters[(counter, labels)]}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host="127.0.0.1"):
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+    def flush(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def flush_every(self, path, interval=15.0):
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.flush(path)
+                except OSError:
+                    pass
+        threading.Thread(target=loop, name="metrics-flush", daemon=True).start()
+
+    def start_from_env(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        port = os.environ.get("MEDEMI_METRICS_PORT")
+        if port:
+            self.serve(int(port), os.environ.get("MEDEMI_METRICS_HOST", "127.0.0.1"))
+        path = os.environ.get("MEDEMI_METRICS_FILE")
+        if path:
+            self.flush_every(path, float(os.environ.get("MEDEMI_METRICS_INTERVAL", "15")))
+
+registry = MetricsRegistry()
@@ -0,0 +1,91 @@
+from triage_core import SYMPTOM_IDS, MODIFIER_IDS, HISTORY_IDS
+
+SET_FIELDS = {"symptoms": SYMPTOM_IDS, "modifiers": MODIFIER_IDS, "past_medical_history": HISTORY_IDS}
+SCALAR_FIELDS = ("age", "gender", "duration", "pain_score", "pregnancy_possible")
+FIELDS = frozenset(SET_FIELDS) | frozenset(SCALAR_FIELDS) | {"habits"}
+
+def _names(value):
+    if isinstance(value, str):
+        value = [value]
+    elif not isinstance(value, (list, tuple, set, frozenset)):
+        return frozenset()
+    return frozenset(v for v in value if isinstance(v, str))
+
+class PatientCase:
+    __slots__ = ("symptoms", "modifiers", "past_medical_history") + SCALAR_FIELDS + ("habits", "extra")
+
+    def __init__(self, symptoms=(), modifiers=(), past_medical_history=(), age=None, gender=None,
+                 duration=None, pain_score=None, pregnancy_possible=None, habits=None, extra=None):
+        self.symptoms = _names(symptoms)
+        self.modifiers = _names(modifiers)
+        self.past_medical_history = _names(past_medical_history)
+        self.age = age
+        self.gender = gender
+        self.duration = duration
+        self.pain_score = pain_score
+        self.pregnancy_possible = pregnancy_possible
+        self.habits = dict(habits or {})
+        self.extra = dict(extra or {})
+
+    @classmethod
+    def from_dict(cls, data):
+        case = cls()
+        case.update(data)
+        return case
+
+    def get(self, key, default=None):
+        if key in FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default)
+
+    def set(self, key, value):
+        if key in SET_FIELDS:
+            setattr(self, key, _names(value))
+        elif key == "habits":
+            self.habits = dict(value) if isinstance(value, dict) else {}
+        elif key in SCALAR_FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+
+    def merge(self, key, value):
+        if key in SET_FIELDS:
+            setattr(self, key, getattr(self, key) | _names(value))
+        else:
+            self.set(key, value)
+
+    def update(self, data, merge=False):
+        for key, value in data.items():
+            if merge:
+                self.merge(key, value)
+            else:
+                self.set(key, value)
+
+    def ordered(self, key):
+        ids = SET_FIELDS[key]
+        return sorted(getattr(self, key), key=lambda name: (ids.get(name, len(ids)), name))
+
+    def copy(self):
+        case = PatientCase.__new__(PatientCase)
+        for name in self.__slots__:
+            setattr(case, name, getattr(self, name))
+        case.habits = dict(self.habits)
+        case.extra = dict(self.extra)
+        return case
+
+    def to_dict(self):
+        data = {key: self.ordered(key) for key in SET_FIELDS}
+        for key in SCALAR_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        data["habits"] = self.habits
+        data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        return isinstance(other, PatientCase) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"PatientCase({self.to_dict()!r})"
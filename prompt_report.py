@@ -0,0 +1,72 @@
+import argparse
+import json
+import time
+
+from prompts import MODEL, PROMPT_TEMPLATES, build_prompt, static_prefix
+
+SAMPLE_TEXTS = [
+    "I have had a severe headache and fever for 3 days, I am 45 years old, male.",
+    "My 6 year old daughter has been vomiting since last night and complains of stomach ache.",
+    "Chest tightness when climbing stairs, history of diabetes and high blood pressure, 67F.",
+    "Feeling hopeless and can't sleep for weeks, on antidepressants.",
+]
+
+def estimate_tokens(text):
+    return max(1, round(len(text) / 4))
+
+def measure(client, prompt):
+    start = time.perf_counter()
+    res = client.generate(model=MODEL, prompt=prompt, options={"num_predict": 1}, keep_alive="30m")
+    wall = time.perf_counter() - start
+    return res.get('prompt_eval_count') or 0, (res.get('prompt_eval_duration') or 0) / 1e6, wall * 1000
+
+def report(versions, texts, live=False):
+    client = None
+    if live:
+        import ollama
+        client = ollama.Client()
+    rows = []
+    for version in versions:
+        prefix = static_prefix(version)
+        for i, text in enumerate(texts):
+            prompt = build_prompt(text, version)
+            row = {
+                "version": version,
+                "sample": i,
+                "prompt_chars": len(prompt),
+                "static_prefix_chars": len(prefix),
+                "estimated_tokens": estimate_tokens(prompt),
+                "estimated_uncached_tokens": estimate_tokens(prompt[len(prefix):]),
+            }
+            if client:
+                tokens, prefill_ms, wall_ms = measure(client, prompt)
+                row.update({"prompt_tokens": tokens, "prefill_ms": round(prefill_ms, 1), "wall_ms": round(wall_ms, 1)})
+            rows.append(row)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Report prompt size and prefill time per extraction prompt version")
+    parser.add_argument("--versions", nargs="+", default=list(PROMPT_TEMPLATES), choices=list(PROMPT_TEMPLATES))
+    parser.add_argument("--text", action="append", help="patient text to build prompts from (repeatable)")
+    parser.add_argument("--live", action="store_true", help="measure real token counts and prefill time against Ollama")
+    parser.add_argument("--json", action="store_true", help="print rows as JSON")
+    args = parser.parse_args()
+
+    rows = report(args.versions, args.text or SAMPLE_TEXTS, args.live)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    columns = list(rows[0])
+    print("  ".join(f"{c:>18}" for c in columns))
+    for row in rows:
+        print("  ".join(f"{str(row.get(c, '')):>18}" for c in columns))
+    for version in args.versions:
+        version_rows = [r for r in rows if r["version"] == version]
+        summary = f"{version}: mean estimated tokens {sum(r['estimated_tokens'] for r in version_rows) / len(version_rows):.0f}"
+        if args.live:
+            summary += f", mean prefill {sum(r['prefill_ms'] for r in version_rows) / len(version_rows):.1f} ms"
+        print(summary)
+
+if __name__ == "__main__":
+    main()
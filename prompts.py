@@ -0,0 +1,149 @@
+from triage_core import symptoms, mods, past
+
+MODEL = "mistral:7b"
+PROMPT_VERSION = "v2"
+
+def _v1_prompt(full_context):
+    return f"""You are a medical information extraction system. Your task is to analyze patient text and extract structured data with high precision.
+
+INPUT TEXT:
+{full_context}
+
+EXTRACTION RULES:
+1. Extract ONLY information explicitly stated in the text
+2. Map extracted terms to the closest match from the allowed lists below
+3. If no close match exists in an allowed list, omit that item
+4. Do not infer, assume, or add information not present in the source text
+5. Preserve clinical accuracy - if uncertain about a mapping, omit it
+
+ALLOWED VALUES:
+
+Symptoms (select all that apply):
+{symptoms}
+
+Modifiers (select all that apply):
+{mods}
+
+Past Medical Conditions (select all that apply):
+{past}
+
+EXTRACTION TARGETS:
+- symptoms: List of current symptoms from allowed symptoms list
+- modifiers: Qualifying terms (severity, frequency, location) from allowed modifiers list
+- past_medical_history: Previous diagnoses/conditions from allowed conditions list
+- duration: How long symptoms have been present (extract exact phrase, e.g., "3 days", "2 weeks")
+- age: Patient age (number only, e.g., "45")
+- gender: Patient gender (e.g., "male", "female", "non-binary", or null if not stated)
+
+OUTPUT FORMAT:
+Return ONLY valid JSON with this exact structure (no additional text):
+{{
+  "symptoms": [],
+  "modifiers": [],
+  "past_medical_history": [],
+  "duration": "",
+  "age": "",
+  "gender": ""
+}}
+
+Now extract from the input text above."""
+
+def _v1_batch_prompt(contexts):
+    cases = "\n\n".join(f"CASE {i}:\n{context}" for i, context in enumerate(contexts, 1))
+    return f"""You are a medical information extraction system. Your task is to analyze several independent patient texts and extract structured data for each with high precision.
+
+EXTRACTION RULES:
+1. Extract ONLY information explicitly stated in each case's own text
+2. Map extracted terms to the closest match from the allowed lists below
+3. If no close match exists in an allowed list, omit that item
+4. Do not infer, assume, or add information not present in the source text
+5. Never carry information from one case into another
+
+ALLOWED VALUES:
+
+Symptoms (select all that apply):
+{symptoms}
+
+Modifiers (select all that apply):
+{mods}
+
+Past Medical Conditions (select all that apply):
+{past}
+
+OUTPUT FORMAT:
+Return ONLY valid JSON (no additional text): an object whose keys are the case numbers ("1", "2", ...) and whose values have this exact structure:
+{{
+  "symptoms": [],
+  "modifiers": [],
+  "past_medical_history": [],
+  "duration": "",
+  "age": "",
+  "gender": ""
+}}
+
+INPUT CASES:
+{cases}
+
+Now extract every case above."""
+
+def _compact(vocab):
+    return ", ".join(vocab)
+
+V2_PREFIX = f"""You are a medical information extraction system. Extract structured data from patient text with high precision.
+
+RULES:
+1. Extract ONLY information explicitly stated in the text
+2. Map extracted terms to the closest match from the allowed values below
+3. If no close match exists, omit that item
+4. Do not infer, assume, or add information not present in the source text
+5. Preserve clinical accuracy - if uncertain about a mapping, omit it
+
+ALLOWED VALUES (comma-separated):
+SYMPTOMS: {_compact(symptoms)}
+MODIFIERS: {_compact(mods)}
+PAST MEDICAL CONDITIONS: {_compact(past)}
+
+TARGETS:
+- symptoms, modifiers, past_medical_history: lists of allowed values only
+- duration: exact phrase, e.g. "3 days"
+- age: number only, e.g. "45"
+- gender: e.g. "male", "female", "non-binary", or null if not stated
+
+OUTPUT: ONLY valid JSON, no other text, with this structure:
+{{"symptoms": [], "modifiers": [], "past_medical_history": [], "duration": "", "age": "", "gender": ""}}
+"""
+
+def _v2_prompt(full_context):
+    return f"""{V2_PREFIX}
+INPUT TEXT:
+{full_context}
+
+JSON:"""
+
+def _v2_batch_prompt(contexts):
+    cases = "\n\n".join(f"CASE {i}:\n{context}" for i, context in enumerate(contexts, 1))
+    return f"""{V2_PREFIX}
+The cases below are independent; never carry information between them. Return ONE JSON object whose keys are the case numbers ("1", "2", ...) and whose values use the structure above.
+
+{cases}
+
+JSON:"""
+
+PROMPT_TEMPLATES = {
+    "v1": (_v1_prompt, _v1_batch_prompt),
+    "v2": (_v2_prompt, _v2_batch_prompt),
+}
+
+def static_prefix(version=PROMPT_VERSION):
+    single = PROMPT_TEMPLATES[version][0]
+    a, b = single("\x00"), single("\x01")
+    n = 0
+    while a[n] == b[n]:
+        n += 1
+    return a[:n]
+
+def build_prompt(full_context, version=PROMPT_VERSION):
+    return PROMPT_TEMPLATES[version][0](full_context)
+
+def build_batch_prompt(contexts, version=PROMPT_VERSION):
+    return PROMPT_TEMPLATES[version][1](contexts)
@@ -0,0 +1,241 @@
+import re
+
+from fast_extract import NEGATION, fast_extract
+from triage_core import (MODIFIER_WEIGHTS, HISTORY_WEIGHTS, PSYCHIATRIC_MEDS, SYMPTOM_IDS, past, triage, doc,
+                         urgency_band)
+
+PAIN_SYMPTOMS = frozenset(["chest pain", "abdominal pain", "headache", "back pain", "pelvic pain"])
+PREGNANCY_SYMPTOMS = frozenset(["nausea", "vomiting", "fatigue", "missed period", "pelvic pain"])
+MEDICATION_HISTORY = frozenset(["on antidepressants", "on antipsychotics", "on mood stabilizers",
+                                "on anti-anxiety medication", "on birth control"])
+EATING_SYMPTOMS = frozenset(["vomiting", "appetite changes"])
+SEVERITY_MODIFIERS = ["mild", "moderate", "severe"]
+DEMOGRAPHIC_QUESTIONS = frozenset(["age", "gender", "duration"])
+MANDATORY_QUESTIONS = DEMOGRAPHIC_QUESTIONS | {"pain_scale", "pregnancy_possibility"}
+AFFIRMATIVE = re.compile(r"^\s*(yes|yeah|yep|yup|y|sure|definitely)\b")
+
+def is_pediatric_patient(age_str):
+    try:
+        age = int(age_str)
+        return age < 18
+    except:
+        return "month" in age_str.lower()
+
+def is_appropriate_for_guardian_questions(age_str):
+    try:
+        age = int(age_str)
+        return age < 13
+    except:
+        return True
+
+def format_question(question, is_guardian_context):
+    if is_guardian_context:
+        question = question.replace("Do you", "Does the patient")
+        question = question.replace("Are you", "Is the patient")
+        question = question.replace("Have you", "Has the patient")
+        question = question.replace("your", "the patient's")
+        question = question.replace("Your", "The patient's")
+    return question
+
+def _has_pain(case):
+    return not PAIN_SYMPTOMS.isdisjoint(case.get("symptoms", []))
+
+def _pregnancy_relevant(case):
+    age = case.get("age", "")
+    if age and is_pediatric_patient(age):
+        return False
+    try:
+        age_num = int(age) if age else 0
+        return (15 <= age_num <= 50 and case.get("gender", "").lower() in ["female", "f", "woman"]
+                and not PREGNANCY_SYMPTOMS.isdisjoint(case.get("symptoms", [])))
+    except:
+        return False
+
+class _Answered:
+    __slots__ = ("case", "field", "names")
+
+    def __init__(self, case, field, name):
+        self.case = case
+        self.field = field
+        self.names = frozenset(case.get(field, ())) | {name}
+
+    def get(self, key, default=None):
+        if key == self.field:
+            return self.names
+        return self.case.get(key, default)
+
+def outcome(case):
+    return urgency_band(triage(case)[0]), doc(case)[0]
+
+def _compile_answers(answers):
+    groups = {}
+    for field, name in answers:
+        if field == "modifiers":
+            key = (field, MODIFIER_WEIGHTS.get(name, 0))
+        elif field == "past_medical_history":
+            key = (field, HISTORY_WEIGHTS.get(name, 0), name in PSYCHIATRIC_MEDS)
+        else:
+            key = (field, name)
+        if key in groups:
+            groups[key][2] += 1
+        else:
+            groups[key] = [field, name, 1]
+    return tuple(tuple(group) for group in groups.values())
+
+class Question:
+    __slots__ = ("key", "text", "needed", "implied", "formatted", "candidates", "confirms", "answers",
+                 "_rendered")
+
+    def __init__(self, key, text, needed=None, implied=None, formatted=True, answers=(), confirms=False):
+        self.key = key
+        self.text = text
+        self.needed = needed
+        self.implied = implied
+        self.formatted = formatted
+        self.candidates = tuple(answers)
+        self.confirms = confirms
+        self.answers = _compile_answers(answers)
+        self._rendered = {}
+
+    def facts(self, reply):
+        if not self.candidates:
+            return []
+        if self.confirms:
+            reply = reply.lower()
+            if AFFIRMATIVE.match(reply) and not NEGATION.search(reply):
+                return list(self.candidates)
+            return []
+        found, _ = fast_extract(reply)
+        return [(field, name) for field, name in self.candidates if name in found[field]]
+
+    def gain(self, case, current):
+        if not self.answers:
+            return 0.0
+        band, specialty = current
+        changed = total = 0
+        for field, name, count in self.answers:
+            total += count
+            answered = _Answered(case, field, name)
+            if urgency_band(triage(answered)[0]) != band:
+                changed += count
+            elif field == "symptoms" and doc(answered)[0] != specialty:
+                changed += count
+        return changed / (total + 1)
+
+    def render(self, case, guardian):
+        symptom = case.ordered("symptoms")[0] if "{symptom}" in self.text else None
+        key = (symptom, guardian and self.formatted)
+        text = self._rendered.get(key)
+        if text is None:
+            text = self.text.format(symptom=symptom) if symptom else self.text
+            text = format_question(text, key[1])
+            if symptom is None or symptom in SYMPTOM_IDS:
+                self._rendered[key] = text
+        return text
+
+QUESTIONS = [
+    Question("pain_scale",
+             "On a scale of 0-10, where 0 is no pain and 10 is the worst pain imaginable, how would you rate the pain?",
+             needed=_has_pain, implied=lambda case: case.get("pain_score") is not None),
+    Question("pregnancy_possibility", "Is there any possibility of pregnancy?",
+             needed=_pregnancy_relevant, implied=lambda case: case.get("pregnancy_possible") is not None,
+             formatted=False),
+    Question("age", "What is the patient's age?",
+             needed=lambda case: not case.get("age"), formatted=False),
+    Question("gender", "What is the patient's gender? (male/female/other)",
+             needed=lambda case: not case.get("gender"), formatted=False),
+    Question("duration", "How long have the symptoms been present?",
+             needed=lambda case: not case.get("duration")),
+    Question("modifiers", "How would you describe the severity of the {symptom}? (mild/moderate/severe)",
+             needed=lambda case: not case.get("modifiers") and case.get("symptoms"),
+             answers=[("modifiers", m) for m in SEVERITY_MODIFIERS]),
+    Question("past_medical_history", "Are there any existing medical conditions or chronic illnesses?",
+             needed=lambda case: not case.get("past_medical_history"),
+             answers=[("past_medical_history", p) for p in past]),
+    Question("current_medications", "Are you currently taking any medications? If yes, please list them.",
+             implied=lambda case: not MEDICATION_HISTORY.isdisjoint(case.get("past_medical_history", [])),
+             answers=[("past_medical_history", p) for p in sorted(MEDICATION_HISTORY)]),
+    Question("allergies", "Do you have any known allergies (medications, food, environmental)?",
+             implied=lambda case: "allergies" in case.get("past_medical_history", []),
+             answers=[("past_medical_history", "allergies")], confirms=True),
+    Question("previous_episodes", "Have you experienced similar symptoms before?",
+             needed=lambda case: case.get("symptoms"),
+             implied=lambda case: "recurring" in case.get("modifiers", []),
+             answers=[("modifiers", "recurring")], confirms=True),
+    Question("fever_present", "Do you have a fever? If yes, what is your temperature?",
+             needed=lambda case: "fever" not in case.get("symptoms", []),
+             answers=[("symptoms", "fever")], confirms=True),
+    Question("eating_drinking", "Are you able to eat and drink normally?",
+             implied=lambda case: not EATING_SYMPTOMS.isdisjoint(case.get("symptoms", [])),
+             answers=[("symptoms", s) for s in sorted(EATING_SYMPTOMS)]),
+    Question("sleep_patterns", "How have your sleep patterns been affected?",
+             implied=lambda case: "insomnia" in case.get("symptoms", []),
+             answers=[("symptoms", "insomnia")]),
+]
+
+QUESTIONS_BY_KEY = {question.key: question for question in QUESTIONS}
+
+def answer_facts(key, reply):
+    question = QUESTIONS_BY_KEY.get(key)
+    return question.facts(reply) if question is not None else []
+
+class QuestionPlan:
+    def __init__(self, asked=()):
+        self.asked = set(asked)
+        self.skipped = set()
+        self.remaining = [q for q in QUESTIONS if q.key not in self.asked]
+
+    def next(self, case, only=None):
+        age = case.get("age", "")
+        guardian = is_appropriate_for_guardian_questions(age) if age else False
+        found = None
+        implied = []
+        candidates = []
+        for question in self.remaining:
+            if only is not None and question.key not in only:
+                continue
+            if question.implied is not None and question.implied(case):
+                implied.append(question.key)
+                continue
+            if question.needed is None or question.needed(case):
+                if question.key in MANDATORY_QUESTIONS:
+                    found = question
+                    break
+                candidates.append(question)
+        if implied:
+            self.skipped.update(implied)
+            self.remaining = [q for q in self.remaining if q.key not in self.skipped]
+        if found is None and candidates:
+            current = outcome(case)
+            best = 0.0
+            for question in candidates:
+                gain = question.gain(case, current)
+                if gain > best:
+                    found, best = question, gain
+        if found is None:
+            return None, None
+        return found.key, found.render(case, guardian)
+
+    def ask(self, key):
+        self.asked.add(key)
+        self.remaining = [q for q in self.remaining if q.key != key]
+
+    def retry(self, key):
+        self.asked.discard(key)
+        self.remaining = [q for q in QUESTIONS if q.key not in self.asked and q.key not in self.skipped]
+
+    @classmethod
+    def from_dict(cls, data):
+        plan = cls(data.get("asked", ()))
+        plan.skipped = set(data.get("skipped", ()))
+        plan.remaining = [q for q in plan.remaining if q.key not in plan.skipped]
+        return plan
+
+    def to_dict(self):
+        return {"asked": sorted(self.asked), "skipped": sorted(self.skipped)}
+
+def get_demographic_question(patient_info, asked_questions):
+    return QuestionPlan(asked_questions).next(patient_info, DEMOGRAPHIC_QUESTIONS)
+
+def get_follow_up_question(patient_info, asked_questions):
+    return QuestionPlan(asked_questions).next(patient_info)
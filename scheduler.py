@@ -0,0 +1,46 @@
+from availability import engine as availability, first_bookable_day, parse_interval
+from triage_core import urgency_band
+
+SCHEDULING_WINDOWS = {"IMMEDIATE": 1, "URGENT": 2, "LESS URGENT": 3, "NON-URGENT": 7}
+EARLIEST_FIRST = {"IMMEDIATE", "URGENT"}
+
+def _earliest(specialties, start, days):
+    best = None
+    for rank, specialty in enumerate(specialties):
+        found = availability.earliest_free(specialty, days, start)
+        if found:
+            doctor, day, label = found
+            key = (day, parse_interval(label)[0], rank)
+            if best is None or key < best[0]:
+                best = (key, specialty, doctor, day, label)
+    return best and best[1:]
+
+def _balanced(specialties, start, days):
+    for specialty in specialties:
+        doctors = sorted(availability.doctors_for(specialty),
+                         key=lambda d: (availability.load(d), availability.units(d).starts[0]))
+        best = None
+        for doctor in doctors:
+            load = availability.load(doctor)
+            if best is not None and (load, start, availability.units(doctor).starts[0]) >= best[0]:
+                break
+            slot = availability.next_free(doctor, days, start)
+            if slot is None:
+                continue
+            key = (load, slot[0], parse_interval(slot[1])[0])
+            if best is None or key < best[0]:
+                best = (key, doctor, slot)
+        if best:
+            return specialty, best[1], best[2][0], best[2][1]
+    return None
+
+def assign(score, specialties, start=None):
+    start = start or first_bookable_day()
+    band = urgency_band(score)
+    window = SCHEDULING_WINDOWS[band]
+    pick = _earliest if band in EARLIEST_FIRST else _balanced
+    found = pick(specialties, start, window) or _earliest(specialties, start, availability.horizon_days)
+    if not found:
+        return None
+    specialty, doctor, day, label = found
+    return {"urgency": band, "specialty": specialty, "doctor": doctor, "date": day, "slot": label}
@@ -0,0 +1,168 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import registry as metrics
+from patient_case import PatientCase
+from questionnaire import QuestionPlan
+
+SESSIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions.db")
+CONSULTATION_FIELDS = ("messages", "stage", "patient_info", "question_plan", "conversation_history",
+                       "initial_text", "validation_errors", "current_question_key", "triage_score")
+INTAKE_FIELDS = ("question_plan", "conversation_history", "initial_text", "validation_errors",
+                 "current_question_key")
+FINISHED_STAGES = ("show_assessment",)
+
+def compact(state, max_messages=60):
+    if state.get("stage") in FINISHED_STAGES:
+        for field in INTAKE_FIELDS:
+            state.pop(field, None)
+    messages = state.get("messages")
+    if messages and len(messages) > max_messages:
+        state["messages"] = messages[:1] + messages[-(max_messages - 1):]
+    return state
+
+def encode(state):
+    data = dict(state)
+    if "patient_info" in data:
+        data["patient_info"] = data["patient_info"].to_dict()
+    if "question_plan" in data:
+        data["question_plan"] = data["question_plan"].to_dict()
+    return json.dumps(data, separators=(",", ":"))
+
+def decode(raw):
+    state = json.loads(raw)
+    if "patient_info" in state:
+        state["patient_info"] = PatientCase.from_dict(state["patient_info"])
+    if "question_plan" in state:
+        state["question_plan"] = QuestionPlan.from_dict(state["question_plan"])
+    return state
+
+class SessionStore:
+    def __init__(self, path=SESSIONS_FILE, max_active=500, idle_after=300, ttl=6 * 3600, sweep_every=60,
+                 max_messages=60):
+        self.path = path
+        self.max_active = max_active
+        self.idle_after = idle_after
+        self.ttl = ttl
+        self.sweep_every = sweep_every
+        self.max_messages = max_messages
+        self._lock = threading.Lock()
+        self._active = OrderedDict()
+        self._spilling = {}
+        self._last_sweep = time.time()
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS sessions (
+                                session_id TEXT PRIMARY KEY,
+                                updated_at REAL NOT NULL,
+                                data TEXT NOT NULL)""")
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated_at)")
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id):
+        now = time.time()
+        with self._lock:
+            entry = self._active.get(session_id) or self._spilling.get(session_id)
+            if entry is not None:
+                if now - entry[0] <= self.ttl:
+                    self._active[session_id] = entry
+                    self._active.move_to_end(session_id)
+                    return entry[1]
+                self._active.pop(session_id, None)
+        row = self._connect().execute("SELECT updated_at, data FROM sessions WHERE session_id = ?",
+                                      (session_id,)).fetchone()
+        if row is None:
+            return None
+        if now - row[0] > self.ttl:
+            self.discard(session_id)
+            metrics.inc("sessions", event="expired")
+            return None
+        state = decode(row[1])
+        metrics.inc("sessions", event="restored")
+        self.save(session_id, state)
+        return state
+
+    def save(self, session_id, state):
+        now = time.time()
+        compact(state, self.max_messages)
+        with self._lock:
+            self._active[session_id] = (now, state)
+            self._active.move_to_end(session_id)
+            spilled = []
+            if len(self._active) > self.max_active:
+                while len(self._active) > self.max_active * 0.9:
+                    spilled.append(self._active.popitem(last=False))
+                self._spilling.update(spilled)
+            sweep = now - self._last_sweep >= self.sweep_every
+            if sweep:
+                self._last_sweep = now
+        self._spill(spilled)
+        if sweep:
+            self.sweep(now)
+
+    def discard(self, session_id):
+        with self._lock:
+            self._active.pop(session_id, None)
+            self._spilling.pop(session_id, None)
+        self._connect().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def sweep(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            idle = [(session_id, entry) for session_id, entry in self._active.items()
+                    if now - entry[0] >= min(self.idle_after, self.ttl)]
+            for session_id, _ in idle:
+                del self._active[session_id]
+            live = [(session_id, entry) for session_id, entry in idle if now - entry[0] <= self.ttl]
+            self._spilling.update(live)
+        self._spill(live)
+        cur = self._connect().execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl,))
+        expired = len(idle) - len(live) + max(cur.rowcount, 0)
+        if expired:
+            metrics.inc("sessions", expired, event="expired")
+
+    def _spill(self, entries):
+        if not entries:
+            return
+        try:
+            self._write([(session_id, updated_at, encode(state)) for session_id, (updated_at, state) in entries])
+        except:
+            self._settle(entries, keep=True)
+            raise
+        self._settle(entries)
+        metrics.inc("sessions", len(entries), event="spilled")
+
+    def _write(self, rows):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR REPLACE INTO sessions (session_id, updated_at, data) VALUES (?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _settle(self, entries, keep=False):
+        with self._lock:
+            for session_id, entry in entries:
+                if self._spilling.get(session_id) is entry:
+                    del self._spilling[session_id]
+                    if keep:
+                        self._active.setdefault(session_id, entry)
+
+    def active_count(self):
+        with self._lock:
+            return len(self._active)
+
+store = SessionStore()
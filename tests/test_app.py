@@ -0,0 +1,93 @@
+import json
+import os
+
+import ollama
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import booking_store
+import extraction
+import session_store
+from extraction_cache import ExtractionCache
+from triage_core import triage
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+class FakeAsyncClient:
+    response = {}
+    prompts = []
+
+    def __init__(self, host=None, **kwargs):
+        pass
+
+    async def generate(self, model=None, prompt=None, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        text = json.dumps(self.response)
+        if not stream:
+            return {"response": text}
+        async def chunks():
+            for i in range(0, len(text), 7):
+                yield {"response": text[i:i + 7], "done": False}
+            yield {"response": "", "done": True}
+        return chunks()
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(ollama, "AsyncClient", FakeAsyncClient)
+    monkeypatch.setattr(FakeAsyncClient, "prompts", [])
+    monkeypatch.setattr(session_store, "store", session_store.SessionStore(str(tmp_path / "sessions.db")))
+    monkeypatch.setattr(booking_store, "store", booking_store.BookingStore(str(tmp_path / "bookings.db")))
+    monkeypatch.setattr(extraction, "extraction_cache", ExtractionCache(str(tmp_path / "cache.db")))
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    assert not at.exception
+    return at
+
+def _priorities(at):
+    return [e.value for e in list(at.error) + list(at.warning) + list(at.info) + list(at.success)
+            if "PRIORITY" in str(e.value)]
+
+def _state(at):
+    return session_store.store.load(at.session_state["session_id"])
+
+def test_complete_first_message_is_triaged_before_assessment(app, monkeypatch):
+    monkeypatch.setattr(FakeAsyncClient, "response", {
+        "symptoms": ["shortness of breath", "fever", "cough"], "modifiers": ["severe"],
+        "past_medical_history": [], "duration": "2 days", "age": "70", "gender": "male"})
+    app.chat_input[0].set_value("my dad is 70 and has been struggling to breathe, he keeps coughing and feels awful").run()
+    assert not app.exception
+
+    assert FakeAsyncClient.prompts
+    state = _state(app)
+    assert state["stage"] == "show_assessment"
+    assert state["triage_score"] == 22.5
+    priorities = _priorities(app)
+    assert priorities and "IMMEDIATE" in priorities[0]
+
+NEGATED = {"fever_present": "I do not", "allergies": "I have no allergies",
+           "previous_episodes": "I have never had this"}
+
+def test_negated_yes_no_replies_add_no_facts(app, monkeypatch):
+    monkeypatch.setattr(FakeAsyncClient, "response", {
+        "symptoms": ["shortness of breath", "cough"], "modifiers": ["severe"],
+        "past_medical_history": [], "duration": "2 days", "age": "70", "gender": "male"})
+    app.chat_input[0].set_value("my dad is 70 and has been struggling to breathe, he keeps coughing and feels awful").run()
+    assert not app.exception
+
+    asked = []
+    while _state(app)["stage"] == "questions":
+        key = _state(app)["current_question_key"]
+        asked.append(key)
+        app.chat_input[0].set_value(NEGATED.get(key, "no")).run()
+        assert not app.exception
+        assert len(asked) < 20
+
+    assert "fever_present" in asked
+    assert len(FakeAsyncClient.prompts) > 1
+    state = _state(app)
+    assert state["stage"] == "show_assessment"
+    case = state["patient_info"]
+    assert "fever" not in case.symptoms
+    assert "recurring" not in case.modifiers
+    assert "allergies" not in case.past_medical_history
+    assert state["triage_score"] == triage(case)[0] == 17.5
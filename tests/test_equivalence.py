@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from benchmark import generate_cases
+from bulk_triage import score_cases
+from patient_case import PatientCase
+from triage_core import _score, get_possible_diagnoses, triage, triage_batch
+
+CASES = [case for case, _, _ in generate_cases(2000, seed=7)]
+
+def _with_noise(cases, seed=11):
+    r = random.Random(seed)
+    rows = []
+    for case in cases:
+        data = case.to_dict()
+        if r.random() < 0.1:
+            data["symptoms"] = data["symptoms"] + ["something odd"]
+        if r.random() < 0.05:
+            data["age"] = r.choice(["", "unknown", "forty", None])
+        if r.random() < 0.05:
+            data["habits"] = {"drug_use": True}
+        rows.append(data)
+    return rows
+
+ROWS = _with_noise(CASES)
+
+def test_slotted_triage_matches_dict():
+    for data in ROWS:
+        case = PatientCase.from_dict(data)
+        assert triage(case)[0] == _score(data), data
+
+def test_bulk_triage_matches_scalar():
+    scores = score_cases(ROWS)
+    assert len(scores) == len(ROWS)
+    for data, score in zip(ROWS, scores):
+        assert float(score) == pytest.approx(_score(data), abs=1e-9), data
+
+def test_triage_batch_matches_scalar():
+    cases = [PatientCase.from_dict(data) for data in ROWS]
+    assert triage_batch(cases) == [_score(data) for data in ROWS]
+
+def test_diagnoses_match_for_dict_and_slotted():
+    for data in ROWS:
+        assert get_possible_diagnoses(PatientCase.from_dict(data)) == get_possible_diagnoses(data), data
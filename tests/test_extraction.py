@@ -0,0 +1,55 @@
+import asyncio
+import threading
+import time
+
+import ollama
+import pytest
+
+import extraction
+from async_client import AsyncExtractionClient
+from extraction_cache import ExtractionCache
+
+HEAD = '{"symptoms": ["chest pain", "cough"], '
+TAIL = '"modifiers": ["severe"], "past_medical_history": [], "duration": "2 days", "age": "", "gender": ""}'
+
+class HeldClient:
+    release = None
+
+    def __init__(self, host=None, **kwargs):
+        pass
+
+    async def generate(self, model=None, prompt=None, stream=False, **kwargs):
+        async def chunks():
+            yield {"response": HEAD, "done": False}
+            while not self.release.is_set():
+                await asyncio.sleep(0.01)
+            yield {"response": TAIL, "done": True}
+        return chunks()
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(HeldClient, "release", threading.Event())
+    monkeypatch.setattr(ollama, "AsyncClient", HeldClient)
+    monkeypatch.setattr(extraction, "extraction_cache", ExtractionCache(str(tmp_path / "cache.db")))
+    client = AsyncExtractionClient("test")
+    monkeypatch.setattr(extraction, "llm_client", client)
+    yield client
+    HeldClient.release.set()
+    client.close()
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+def test_closed_fields_are_available_before_the_request_finishes(client):
+    future = extraction.extract_in_background("something is off with my chest, not sure what")
+    _wait_for(lambda: "symptoms" in future.partial())
+    assert not future.done()
+    assert future.partial() == {"symptoms": ["chest pain", "cough"]}
+
+    HeldClient.release.set()
+    fields = future.result(timeout=5)
+    assert fields["modifiers"] == ["severe"]
+    assert future.partial() == fields
@@ -0,0 +1,25 @@
+from fast_extract import fast_extract, is_confident
+
+def test_negation_stops_at_coordinators():
+    result, _ = fast_extract("She has no appetite and severe abdominal pain, vomiting since yesterday")
+    assert result["symptoms"] == ["abdominal pain", "vomiting"]
+    assert result["modifiers"] == ["severe"]
+
+def test_negation_carries_over_or():
+    result, _ = fast_extract("no fever or chills, bad cough")
+    assert result["symptoms"] == ["cough"]
+
+def test_negated_terms_do_not_count_as_covered():
+    result, coverage = fast_extract("denies fever and chills")
+    assert not is_confident(result, coverage)
+
+def test_family_history_is_not_the_patients_history():
+    result, coverage = fast_extract("my father had heart attack and I have chest pain")
+    assert result["past_medical_history"] == []
+    assert result["symptoms"] == ["chest pain"]
+    assert not is_confident(result, coverage)
+
+def test_plain_description_stays_on_the_fast_path():
+    result, coverage = fast_extract("70 year old man with severe shortness of breath, fever and cough for 2 days")
+    assert result["symptoms"] == ["shortness of breath", "fever", "cough"]
+    assert is_confident(result, coverage)
@@ -0,0 +1,44 @@
+import pytest
+
+from patient_case import PatientCase
+from questionnaire import QuestionPlan, answer_facts
+
+@pytest.mark.parametrize("key, reply", [
+    ("fever_present", "I do not"),
+    ("fever_present", "I do"),
+    ("fever_present", "no"),
+    ("fever_present", "yes but not now"),
+    ("allergies", "I have no allergies"),
+    ("allergies", "yes, none that I know of"),
+    ("previous_episodes", "I have never had this"),
+    ("previous_episodes", "yeah, never this bad"),
+])
+def test_negated_or_unclear_replies_add_no_facts(key, reply):
+    assert answer_facts(key, reply) == []
+
+@pytest.mark.parametrize("key, reply, expected", [
+    ("fever_present", "yes 39", [("symptoms", "fever")]),
+    ("allergies", "Yes, penicillin", [("past_medical_history", "allergies")]),
+    ("previous_episodes", "yep", [("modifiers", "recurring")]),
+])
+def test_affirmative_replies_confirm_the_question(key, reply, expected):
+    assert answer_facts(key, reply) == expected
+
+def _asked(case):
+    plan = QuestionPlan()
+    order = []
+    key, _ = plan.next(case)
+    while key is not None:
+        order.append(key)
+        plan.ask(key)
+        key, _ = plan.next(case)
+    return order
+
+def test_severity_is_asked_first_for_chest_pain():
+    case = PatientCase(symptoms=["chest pain"], age="70", gender="male", duration="2 days", pain_score=7)
+    assert _asked(case)[0] == "modifiers"
+
+def test_history_is_asked_for_chest_pain_with_breathlessness():
+    case = PatientCase(symptoms=["chest pain", "shortness of breath"], age="55", gender="male",
+                       duration="2 days", pain_score=6)
+    assert "past_medical_history" in _asked(case)
@@ -0,0 +1,26 @@
+import threading
+
+from session_store import SessionStore
+
+def test_spilling_session_stays_visible_until_written(tmp_path, monkeypatch):
+    store = SessionStore(str(tmp_path / "sessions.db"), max_active=2)
+    writing = threading.Event()
+    release = threading.Event()
+    write = store._write
+
+    def slow_write(rows):
+        writing.set()
+        release.wait(5)
+        write(rows)
+
+    monkeypatch.setattr(store, "_write", slow_write)
+    store.save("a", {"stage": "questions"})
+    store.save("b", {"stage": "questions"})
+    saver = threading.Thread(target=store.save, args=("c", {"stage": "questions"}))
+    saver.start()
+    assert writing.wait(5)
+    assert store.load("a") == {"stage": "questions"}
+    release.set()
+    saver.join(5)
+    assert store.load("a") == {"stage": "questions"}
+    assert store.load("b") == {"stage": "questions"}
@@ -0,0 +1,391 @@
+import json
+import os
+from array import array
+
+symptoms = ["fever", "cough", "headache", "nausea", "fatigue", "dizziness", "shortness of breath", 
+            "chest pain", "abdominal pain", "diarrhea", "vomiting", "sore throat", "runny nose", 
+            "muscle aches", "joint pain", "rash", "swelling", "weight loss", "weight gain", 
+            "night sweats", "chills", "edema", "orthopnea", "reduced urine output", "back pain", "neck pain",
+            "insomnia", "anxiety", "panic attacks", "mood swings", "sadness", "hopelessness", 
+            "loss of interest", "difficulty concentrating", "memory problems", "restlessness", 
+            "irritability", "suicidal thoughts", "hallucinations", "paranoia", "racing thoughts",
+            "appetite changes", "social withdrawal", "excessive worry",
+            "pelvic pain", "abnormal vaginal bleeding", "missed period", "irregular periods", 
+            "heavy menstrual bleeding", "painful periods", "vaginal discharge", "painful intercourse",
+            "breast pain", "breast lumps", "hot flashes", "vaginal itching", "vaginal dryness",
+            "spotting between periods", "postmenopausal bleeding", "painful urination", "frequent urination",
+            "lower back pain", "bloating", "constipation", "painful bowel movements during period",
+            "painful ovulation", "breast tenderness", "nipple discharge", "vulvar pain",
+            "burning sensation during urination", "urgency to urinate"]
+
+mods = ["mild", "moderate", "severe", "intermittent", "constant", "sudden onset", "gradual onset", 
+        "worsening", "improving", "persistent", "recurring", "sharp", "dull", "throbbing", 
+        "burning", "stabbing", "cramping"]
+
+past = ["diabetes", "hypertension", "asthma", "heart disease", "cancer", "stroke", "kidney disease", 
+        "liver disease", "COPD", "arthritis", "depression", "anxiety", "thyroid disorder", 
+        "autoimmune disease", "allergies", "previous surgeries", "cardiomyopathy",
+        "bipolar disorder", "schizophrenia", "PTSD", "OCD", "panic disorder", "eating disorder",
+        "ADHD", "autism", "personality disorder", "substance abuse disorder",
+        "on antidepressants", "on antipsychotics", "on mood stabilizers", "on anti-anxiety medication",
+        "PCOS", "endometriosis", "fibroids", "ovarian cysts", "menopause", "pregnancy complications",
+        "previous miscarriage", "infertility", "cervical dysplasia", "on birth control",
+        "pelvic inflammatory disease", "adenomyosis", "uterine prolapse", "ovarian cancer",
+        "breast cancer", "cervical cancer", "endometrial cancer", "HPV", "sexually transmitted infection",
+        "gestational diabetes", "preeclampsia", "ectopic pregnancy", "cesarean section",
+        "hysterectomy", "tubal ligation"]
+
+habits = ["smoking", "alcohol", "drug use", "vaping", "tobacco chewing"]
+
+SYMPTOM_WEIGHTS = {"fever": 2, "cough": 1, "shortness of breath": 3, "chest pain": 3, "abdominal pain": 2,
+                   "diarrhea": 1, "vomiting": 1, "sore throat": 1, "runny nose": 1, "muscle aches": 1,
+                   "joint pain": 1, "rash": 2, "swelling": 2, "weight loss": 2, "weight gain": 1,
+                   "night sweats": 2, "chills": 1, "edema": 2, "orthopnea": 3, "reduced urine output": 3,
+                   "dizziness": 2, "nausea": 1, "back pain": 2, "neck pain": 2,
+                   "insomnia": 1, "anxiety": 2, "panic attacks": 3, "mood swings": 2, "sadness": 1,
+                   "hopelessness": 3, "loss of interest": 2, "difficulty concentrating": 1, "memory problems": 2,
+                   "restlessness": 1, "irritability": 1, "suicidal thoughts": 5, "hallucinations": 4,
+                   "paranoia": 3, "racing thoughts": 2, "appetite changes": 1, "social withdrawal": 2,
+                   "excessive worry": 2,
+                   "pelvic pain": 2, "abnormal vaginal bleeding": 3, "missed period": 1,
+                   "irregular periods": 1, "heavy menstrual bleeding": 2, "painful periods": 1,
+                   "vaginal discharge": 1, "painful intercourse": 1, "breast pain": 1, "breast lumps": 3,
+                   "hot flashes": 1, "vaginal itching": 1, "vaginal dryness": 1,
+                   "spotting between periods": 2, "postmenopausal bleeding": 3, "painful urination": 2,
+                   "frequent urination": 1, "lower back pain": 1, "bloating": 1, "constipation": 1,
+                   "painful bowel movements during period": 2, "painful ovulation": 1, "breast tenderness": 1,
+                   "nipple discharge": 2, "vulvar pain": 2, "burning sensation during urination": 2,
+                   "urgency to urinate": 1}
+
+MODIFIER_WEIGHTS = {"mild": 1, "moderate": 2, "severe": 3, "intermittent": 1, "constant": 2, "sudden onset": 3,
+                    "gradual onset": 1, "worsening": 2, "improving": -1, "persistent": 2, "recurring": 1,
+                    "sharp": 2, "stabbing": 3, "burning": 2, "throbbing": 1, "cramping": 1}
+
+HISTORY_WEIGHTS = {"diabetes": 2, "hypertension": 2, "asthma": 2, "heart disease": 3, "cancer": 3,
+                   "stroke": 3, "kidney disease": 3, "liver disease": 3, "COPD": 3, "arthritis": 1,
+                   "depression": 2, "anxiety": 2, "thyroid disorder": 1, "autoimmune disease": 2,
+                   "allergies": 1, "previous surgeries": 1, "cardiomyopathy": 3,
+                   "bipolar disorder": 3, "schizophrenia": 3, "PTSD": 2, "OCD": 2, "panic disorder": 2,
+                   "eating disorder": 2, "ADHD": 1, "autism": 1, "personality disorder": 2,
+                   "substance abuse disorder": 3, "on antidepressants": 2, "on antipsychotics": 2,
+                   "on mood stabilizers": 2, "on anti-anxiety medication": 1,
+                   "PCOS": 1, "endometriosis": 2, "fibroids": 1, "ovarian cysts": 1, "menopause": 1,
+                   "pregnancy complications": 2, "previous miscarriage": 1, "infertility": 1,
+                   "cervical dysplasia": 2, "on birth control": 1, "pelvic inflammatory disease": 2,
+                   "adenomyosis": 2, "uterine prolapse": 2, "ovarian cancer": 3, "breast cancer": 3,
+                   "cervical cancer": 3, "endometrial cancer": 3, "HPV": 1, "sexually transmitted infection": 2,
+                   "gestational diabetes": 2, "preeclampsia": 3, "ectopic pregnancy": 3}
+
+PSYCHIATRIC_MEDS = ["on antidepressants", "on antipsychotics", "on mood stabilizers", "on anti-anxiety medication"]
+
+MENTAL_HEALTH_SYMPTOMS = ["suicidal thoughts", "hallucinations", "paranoia", "panic attacks",
+                          "hopelessness", "anxiety", "mood swings", "sadness", "insomnia",
+                          "loss of interest", "social withdrawal"]
+
+SPECIALTY_SYMPTOMS = {
+    "Cardiology": ["chest pain", "shortness of breath", "orthopnea", "edema"],
+    "Pulmonology": ["shortness of breath", "cough", "orthopnea"],
+    "Gastroenterology": ["abdominal pain", "diarrhea", "vomiting", "nausea"],
+    "Neurology": ["headache", "dizziness", "neck pain", "memory problems"],
+    "Infectious Disease": ["fever", "chills", "night sweats"],
+    "Rheumatology": ["joint pain", "muscle aches", "rash"],
+    "Endocrinology": ["weight loss", "weight gain", "fatigue"],
+    "Nephrology": ["reduced urine output", "edema"],
+    "Psychiatry": ["anxiety", "depression", "panic attacks", "mood swings", "insomnia",
+                  "hopelessness", "suicidal thoughts", "hallucinations", "paranoia",
+                  "loss of interest", "racing thoughts", "social withdrawal", "excessive worry",
+                  "irritability", "restlessness", "sadness", "difficulty concentrating"],
+    "Gynecology": ["pelvic pain", "abnormal vaginal bleeding", "missed period", "irregular periods",
+                  "heavy menstrual bleeding", "painful periods", "vaginal discharge",
+                  "painful intercourse", "breast pain", "breast lumps", "hot flashes",
+                  "vaginal itching", "vaginal dryness", "spotting between periods",
+                  "postmenopausal bleeding", "painful ovulation", "breast tenderness",
+                  "nipple discharge", "vulvar pain"],
+    "Urology": ["painful urination", "frequent urination", "burning sensation during urination",
+               "urgency to urinate", "reduced urine output"],
+    "ENT": ["sore throat", "runny nose"],
+    "Dermatology": ["rash", "swelling"],
+    "Orthopedics": ["joint pain", "muscle aches", "back pain"],
+    "General Medicine": ["fever", "cough", "headache", "nausea", "fatigue"]
+}
+
+def _compile_table(vocab, weights, flagged=()):
+    ids = {}
+    for name in list(vocab) + list(weights) + list(flagged):
+        if name not in ids:
+            ids[name] = len(ids)
+    weight = array('b', bytes(len(ids)))
+    flag = array('b', bytes(len(ids)))
+    for name, value in weights.items():
+        weight[ids[name]] = value
+    for name in flagged:
+        flag[ids[name]] = 1
+    return ids, weight, flag
+
+SYMPTOM_IDS, SYMPTOM_WEIGHT, MENTAL_HEALTH = _compile_table(symptoms, SYMPTOM_WEIGHTS, MENTAL_HEALTH_SYMPTOMS)
+MODIFIER_IDS, MODIFIER_WEIGHT = _compile_table(mods, MODIFIER_WEIGHTS)[:2]
+HISTORY_IDS, HISTORY_WEIGHT, PSYCHIATRIC_MED = _compile_table(past, HISTORY_WEIGHTS, PSYCHIATRIC_MEDS)
+
+def _build_specialty_index(specialty_symptoms):
+    specialties = list(specialty_symptoms)
+    index = {}
+    for i, specialty in enumerate(specialties):
+        for sym in specialty_symptoms[specialty]:
+            index.setdefault(sym, []).append(i)
+    return specialties, {sym: (1 + SYMPTOM_WEIGHTS.get(sym, 0), tuple(ids)) for sym, ids in index.items()}
+
+SPECIALTIES, SYMPTOM_SPECIALTIES = _build_specialty_index(SPECIALTY_SYMPTOMS)
+
+def calculate_pain_score(pain_level, pain_description=""):
+    pain_map = {
+        "no pain": 0,
+        "mild": 2,
+        "moderate": 5,
+        "severe": 8,
+        "worst pain ever": 10,
+        "unbearable": 10
+    }
+    
+    score = 0
+    for key, value in pain_map.items():
+        if key in pain_level.lower():
+            score = value
+            break
+    
+    descriptors_high = ["sharp", "stabbing", "burning", "worst", "unbearable"]
+    descriptors_low = ["dull", "aching", "minor"]
+    
+    if any(desc in pain_description.lower() for desc in descriptors_high):
+        score = min(10, score + 1)
+    elif any(desc in pain_description.lower() for desc in descriptors_low):
+        score = max(0, score - 1)
+    
+    return score
+
+def calculate_habit_risk_score(patient_info):
+    risk_score = 0
+    habits_data = patient_info.get("habits", {})
+    symptoms_list = patient_info.get("symptoms", [])
+    
+    if habits_data.get("smoking"):
+        smoking_status = habits_data.get("smoking_details", {})
+        years = smoking_status.get("years", 0)
+        packs_per_day = smoking_status.get("packs_per_day", 0)
+        pack_years = years * packs_per_day
+        
+        base_score = 0
+        if pack_years > 30:
+            base_score = 5
+        elif pack_years > 20:
+            base_score = 4
+        elif pack_years > 10:
+            base_score = 3
+        elif pack_years > 5:
+            base_score = 2
+        else:
+            base_score = 1
+        
+        if any(s in symptoms_list for s in ["shortness of breath", "chest pain", "cough"]):
+            base_score *= 1.5
+        
+        risk_score += base_score
+    
+    if habits_data.get("vaping"):
+        risk_score += 2
+        if "shortness of breath" in symptoms_list or "chest pain" in symptoms_list:
+            risk_score += 2
+    
+    if habits_data.get("alcohol"):
+        alcohol_status = habits_data.get("alcohol_details", {})
+        drinks_per_week = alcohol_status.get("drinks_per_week", 0)
+        
+        if drinks_per_week > 14:
+            risk_score += 3
+        elif drinks_per_week > 7:
+            risk_score += 2
+        else:
+            risk_score += 1
+        
+        if any(s in symptoms_list for s in ["abdominal pain", "nausea", "vomiting"]):
+            risk_score += 2
+    
+    if habits_data.get("drug_use"):
+        risk_score += 4
+        if any(s in symptoms_list for s in ["chest pain", "dizziness", "anxiety"]):
+            risk_score += 3
+    
+    return round(risk_score, 1)
+
+def triage(case):
+    if not isinstance(case, str):
+        return _score(case), case
+    try:
+        s = case.find('{')
+        e = case.rfind('}') + 1
+        data = json.loads(case[s:e])
+    except:
+        return 0, {}
+    
+    return _score(data), data
+
+def triage_batch(cases):
+    return [_score(case) for case in cases]
+
+def _score(data):
+    score = 0
+    has_mental_symptoms = False
+    for s in data.get("symptoms", []):
+        i = SYMPTOM_IDS.get(s)
+        if i is not None:
+            score += SYMPTOM_WEIGHT[i]
+            if MENTAL_HEALTH[i]:
+                has_mental_symptoms = True
+    
+    for m in data.get("modifiers", []):
+        i = MODIFIER_IDS.get(m)
+        if i is not None:
+            score += MODIFIER_WEIGHT[i]
+    
+    pain_score = data.get("pain_score", 0)
+    if pain_score:
+        if pain_score >= 8:
+            score += 5
+        elif pain_score >= 6:
+            score += 3
+        elif pain_score >= 4:
+            score += 2
+        else:
+            score += 1
+    
+    age = data.get("age", "")
+    if age:
+        try:
+            a = int(age)
+            if a >= 60:
+                score *= 1.5 + (a - 60) / 10
+            elif a < 2:
+                score *= 1.3
+        except:
+            pass
+    
+    has_psych_meds = False
+    for p in data.get("past_medical_history", []):
+        i = HISTORY_IDS.get(p)
+        if i is not None:
+            score += HISTORY_WEIGHT[i]
+            if PSYCHIATRIC_MED[i]:
+                has_psych_meds = True
+    
+    if has_psych_meds and has_mental_symptoms:
+        score += 3
+    
+    habits_risk = calculate_habit_risk_score(data)
+    score += habits_risk
+    
+    return round(score, 1)
+
+URGENCY_BANDS = [(20, "IMMEDIATE"), (12, "URGENT"), (6, "LESS URGENT"), (float("-inf"), "NON-URGENT")]
+
+def urgency_band(score):
+    for threshold, band in URGENCY_BANDS:
+        if score >= threshold:
+            return band
+
+def doc(score):
+    ranking = {}
+    for sym in set(score.get("symptoms", [])):
+        entry = SYMPTOM_SPECIALTIES.get(sym)
+        if entry:
+            weight, specialty_ids = entry
+            for i in specialty_ids:
+                ranking[i] = ranking.get(i, 0) + weight
+    
+    if not ranking:
+        return ["General Medicine"]
+    ranked = sorted(ranking, key=lambda i: (-ranking[i], i))
+    return [SPECIALTIES[i] for i in ranked[0:3]]
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "diagnosis_rules.json")
+
+def _compile_rules(path):
+    with open(path) as f:
+        spec = json.load(f)
+    bits = {"symptom": {}, "modifier": {}, "history": {}, "habit": {}}
+    
+    def mask(features):
+        m = 0
+        for feature in features:
+            kind, name = feature.split(":", 1)
+            if name not in bits[kind]:
+                bits[kind][name] = 1 << sum(len(table) for table in bits.values())
+            m |= bits[kind][name]
+        return m
+    
+    urgency_order = {urgency: i for i, urgency in enumerate(spec["urgency_order"])}
+    by_trigger = {}
+    for index, rule in enumerate(spec["rules"]):
+        trigger = mask([rule["trigger"]])
+        by_trigger.setdefault(trigger, []).append((
+            trigger | mask(rule.get("all_of", [])),
+            mask(rule.get("any_of", [])),
+            mask(rule.get("unless", [])),
+            (urgency_order.get(rule["urgency"], len(urgency_order)), index),
+            {"condition": rule["condition"], "reasoning": rule["reasoning"], "urgency": rule["urgency"]},
+        ))
+    triggers = 0
+    for trigger in by_trigger:
+        triggers |= trigger
+    return bits, triggers, by_trigger, spec["default"], spec["max_results"]
+
+RULE_BITS, RULE_TRIGGERS, RULES_BY_TRIGGER, DEFAULT_DIAGNOSIS, MAX_DIAGNOSES = _compile_rules(RULES_FILE)
+
+def _rule_features(patient_info):
+    m = 0
+    for kind, key in (("symptom", "symptoms"), ("modifier", "modifiers"), ("history", "past_medical_history")):
+        table = RULE_BITS[kind]
+        for name in patient_info.get(key, []):
+            m |= table.get(name, 0)
+    habits_data = patient_info.get("habits") or {}
+    for name, bit in RULE_BITS["habit"].items():
+        if habits_data.get(name):
+            m |= bit
+    return m
+
+def get_possible_diagnoses(patient_info):
+    features = _rule_features(patient_info)
+    fired = []
+    pending = features & RULE_TRIGGERS
+    while pending:
+        trigger = pending & -pending
+        pending ^= trigger
+        for required, any_of, unless, order, diagnosis in RULES_BY_TRIGGER[trigger]:
+            if (features & required == required
+                    and (not any_of or features & any_of)
+                    and (not unless or features & unless != unless)):
+                fired.append((order, diagnosis))
+    
+    if not fired:
+        return [dict(DEFAULT_DIAGNOSIS)]
+    
+    fired.sort(key=lambda x: x[0])
+    return [dict(diagnosis) for _, diagnosis in fired[:MAX_DIAGNOSES]]
+
+def get_specialty_reasoning(specialty, symptoms, past_history, habits):
+    reasons = {
+        "Cardiology": "Heart and cardiovascular system evaluation needed",
+        "Pulmonology": "Lung and respiratory system assessment required",
+        "Gastroenterology": "Digestive system evaluation needed",
+        "Neurology": "Nervous system assessment required",
+        "Infectious Disease": "Specialized evaluation for infection symptoms",
+        "Rheumatology": "Joint, muscle, and autoimmune condition assessment",
+        "Endocrinology": "Hormonal and metabolic system evaluation",
+        "Nephrology": "Kidney function assessment needed",
+        "Psychiatry": "Mental health evaluation and treatment needed",
+        "Gynecology": "Women's reproductive health evaluation needed",
+        "Urology": "Urinary system evaluation needed",
+        "ENT": "Ear, nose, and throat evaluation",
+        "Dermatology": "Skin condition evaluation",
+        "Orthopedics": "Bone, joint, and musculoskeletal assessment",
+        "General Medicine": "Comprehensive medical evaluation"
+    }
+    return reasons.get(specialty, "Specialized medical evaluation recommended")